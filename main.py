@@ -1,51 +1,93 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from ttkthemes import ThemedTk
+import tkinter.font as tkfont
 import csv
+import io
 import os
+import re
 import shutil
+import mmap
 import json
+import uuid
+import concurrent.futures
+import heapq
+import time
 from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 import matplotlib.patches as patches
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to the standard json module
+
+USER_DATA_DIR = "user_data"
+
+def ensure_dir(path):
+    """Create a directory if needed"""
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def open_for_writing(path, mode='w', **kwargs):
+    """Open a file for writing, recreating its directory if it was deleted while the app runs"""
+    try:
+        return open(path, mode, **kwargs)
+    except FileNotFoundError:
+        ensure_dir(os.path.dirname(path))
+        return open(path, mode, **kwargs)
 
 # Helper function to get file paths in user_data directory
 def get_data_file_path(filename):
-    """Get the full path for a data file in the user_data directory"""
-    user_data_dir = "user_data"
-    if not os.path.exists(user_data_dir):
-        os.makedirs(user_data_dir)
-    return os.path.join(user_data_dir, filename)
+    """Get the full path for a data file in the user_data directory (created at startup)"""
+    return os.path.join(USER_DATA_DIR, filename)
 
 # Backup functionality
 def get_backup_dir():
     """Get the backup directory path"""
     return r"c:\Users\Mert\Documents\GurgenBudgetTracker"
 
+# The backup log is only written by this process, so it is read once and cached
+_last_backup_cache = None
+
 def get_last_backup_time():
     """Get the timestamp of the last backup"""
+    global _last_backup_cache
+    if _last_backup_cache is not None:
+        return _last_backup_cache
+    
     backup_log_file = "backup_log.json"
+    last_backup = datetime(1970, 1, 1)  # Very old date if no backup log exists
     try:
         if os.path.exists(backup_log_file):
-            with open(backup_log_file, 'r') as f:
-                data = json.load(f)
-                return datetime.fromisoformat(data.get('last_backup', '1970-01-01T00:00:00'))
-    except:
-        pass
-    return datetime(1970, 1, 1)  # Very old date if no backup log exists
+            with open(backup_log_file, 'rb') as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson else json.loads(raw)
+            last_backup = datetime.fromisoformat(data.get('last_backup', '1970-01-01T00:00:00'))
+    except (OSError, ValueError, json.JSONDecodeError) as e:
+        print(f"Could not read backup log: {e}")
+    _last_backup_cache = last_backup
+    return last_backup
 
 def save_backup_time():
     """Save the current time as the last backup time"""
+    global _last_backup_cache
     backup_log_file = "backup_log.json"
+    now = datetime.now()
+    _last_backup_cache = now
     try:
-        data = {'last_backup': datetime.now().isoformat()}
-        with open(backup_log_file, 'w') as f:
-            json.dump(data, f)
-    except:
-        pass  # Fail silently if we can't save backup log
+        if orjson:
+            # orjson serializes datetime natively (ISO 8601)
+            payload = orjson.dumps({'last_backup': now})
+        else:
+            payload = json.dumps({'last_backup': now.isoformat()}).encode('utf-8')
+        with open(backup_log_file, 'wb') as f:
+            f.write(payload)
+    except OSError as e:
+        print(f"Could not save backup log: {e}")
 
 def should_backup():
     """Check if we should perform a backup (once per hour)"""
@@ -54,15 +96,31 @@ def should_backup():
     time_diff = current_time - last_backup
     return time_diff >= timedelta(hours=1)
 
+def user_data_modified_since(source_dir, since):
+    """Check whether any file in the data directory changed after the given time"""
+    with os.scandir(source_dir) as entries:
+        return any(entry.is_file() and datetime.fromtimestamp(entry.stat().st_mtime) > since
+                   for entry in entries)
+
+def copy_if_modified(src, dst):
+    """Copy a file unless the destination already holds an up-to-date copy"""
+    if os.path.exists(dst) and os.stat(src).st_mtime <= os.stat(dst).st_mtime:
+        return dst
+    return shutil.copy2(src, dst)
+
 def backup_user_data():
     """Backup the user_data folder to Documents directory with timestamped folder"""
     if not should_backup():
         return False
     
     try:
-        source_dir = "user_data"
+        source_dir = USER_DATA_DIR
         base_backup_dir = get_backup_dir()
         
+        # Skip the backup entirely if no data file changed since the last one
+        if os.path.exists(source_dir) and not user_data_modified_since(source_dir, get_last_backup_time()):
+            return False
+        
         # Create timestamped folder name
         current_time = datetime.now()
         timestamp = current_time.strftime("%d_%m_%Y_%H%M")
@@ -70,21 +128,15 @@ def backup_user_data():
         timestamped_backup_dir = os.path.join(base_backup_dir, folder_name)
         
         # Create base backup directory if it doesn't exist
-        if not os.path.exists(base_backup_dir):
-            os.makedirs(base_backup_dir)
+        ensure_dir(base_backup_dir)
         
-        # Create timestamped backup directory
-        if not os.path.exists(timestamped_backup_dir):
-            os.makedirs(timestamped_backup_dir)
-        
-        # Copy all files from user_data to timestamped backup directory
+        # Copy user_data into the timestamped backup directory (created as needed),
+        # skipping files already copied there unchanged
         if os.path.exists(source_dir):
-            for filename in os.listdir(source_dir):
-                source_file = os.path.join(source_dir, filename)
-                dest_file = os.path.join(timestamped_backup_dir, filename)
-                
-                if os.path.isfile(source_file):
-                    shutil.copy2(source_file, dest_file)
+            shutil.copytree(source_dir, timestamped_backup_dir, dirs_exist_ok=True,
+                            copy_function=copy_if_modified)
+        elif not os.path.exists(timestamped_backup_dir):
+            os.makedirs(timestamped_backup_dir)
         
         # Save backup timestamp
         save_backup_time()
@@ -95,11 +147,496 @@ def backup_user_data():
         print(f"Backup failed: {e}")
         return False
 
-class BudgetTrackerApp(ThemedTk):
+# CSV reading helpers
+PYARROW_MIN_FILE_SIZE = 1 << 20  # Below this the csv module beats pyarrow's import cost
+CSV_BUFFER_SIZE = 1 << 20  # Larger buffer for whole-file reads and rewrites
+
+def read_csv_rows(path):
+    """Read every non-empty row of a CSV file as a list of strings"""
+    if os.path.getsize(path) >= PYARROW_MIN_FILE_SIZE:
+        rows = read_csv_rows_pyarrow(path)
+        if rows is not None:
+            return rows
+    
+    with open(path, 'r', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
+        return [row for row in csv.reader(f) if row]
+
+def read_csv_rows_pyarrow(path):
+    """Parse a CSV file with pyarrow's C++ reader, or return None if unavailable"""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        return None
+    
+    # Name the columns after the first row so every field is kept as text
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        column_count = len(next(csv.reader(f), []))
+    column_names = [f"f{i}" for i in range(column_count)]
+    
+    try:
+        table = pacsv.read_csv(
+            path,
+            read_options=pacsv.ReadOptions(column_names=column_names),
+            convert_options=pacsv.ConvertOptions(
+                column_types={name: pa.string() for name in column_names},
+                strings_can_be_null=False))
+    except ValueError:
+        return None  # Ragged rows (e.g. old formats), let the csv module handle them
+    
+    columns = [table.column(name).to_pylist() for name in column_names]
+    return [list(row) for row in zip(*columns)]
+
+# Characters that force csv quoting; names containing them are rejected on entry
+_UNSAFE_CSV_RE = re.compile(r'[,"\n\r]')
+
+def format_csv_row(row):
+    """Format a row as a CSV line, skipping the csv module when no field needs quoting"""
+    fields = [str(value) for value in row]
+    if fields == [""] or any(_UNSAFE_CSV_RE.search(field) for field in fields):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(fields)
+        return buffer.getvalue()
+    return ",".join(fields) + "\r\n"
+
+def write_csv_rows(filename, rows, mode='w'):
+    """Write (or append, with mode='a') rows to a CSV file, reporting failures"""
+    try:
+        with open_for_writing(filename, mode, newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
+            f.writelines(format_csv_row(row) for row in rows)
+    except Exception as e:
+        print(f"Error writing to {filename}: {e}")
+
+# Transaction storage helpers
+TRANSACTIONS_HEADER = ["Flow", "Label", "Amount", "Type", "Date", "ID"]
+TOMBSTONE_COMPACTION_THRESHOLD = 1000
+
+def load_transaction_tombstones():
+    """Get the set of ids of deleted transactions"""
+    try:
+        with open(get_data_file_path("transactions_tombstones.csv"), 'r', newline='', encoding='utf-8') as f:
+            return {row[0] for row in csv.reader(f) if row}
+    except FileNotFoundError:
+        return set()
+
+def append_transaction_tombstone(transaction_id):
+    """Mark a transaction as deleted without rewriting the transactions file"""
+    with open_for_writing(get_data_file_path("transactions_tombstones.csv"), 'a', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerow([transaction_id])
+
+def read_transactions():
+    """Read all live transactions (header and deleted rows are skipped)"""
+    tombstones = load_transaction_tombstones()
+    rows = read_csv_rows(get_data_file_path("transactions_database.csv"))
+    return [row for row in rows[1:]  # Skip header
+            if len(row) >= 5 and (len(row) < 6 or row[5] not in tombstones)]
+
+def has_transaction_id(row):
+    """Check whether a transaction row has a (non-empty) id column"""
+    return len(row) >= 6 and row[5] != ""
+
+def ensure_transaction_ids(check_rows=False):
+    """Give every transaction an id column so it can be deleted by tombstone"""
+    transactions_file = get_data_file_path("transactions_database.csv")
+    try:
+        # Only the header is read here; the store parses the whole file afterwards
+        with open(transactions_file, 'r', newline='', encoding='utf-8') as f:
+            header = next((row for row in csv.reader(f) if row), None)
+    except FileNotFoundError:
+        return
+
+    # Files written since ids exist have the ID column in their header; check_rows
+    # also migrates such files when the store found rows without an id in them
+    if header is None or (len(header) >= 6 and not check_rows):
+        return
+
+    # One-time migration of files written before ids existed (the header is fixed
+    # even without data rows, as rows appended later always carry an id)
+    with open(transactions_file, 'r', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
+        rows = [row for row in csv.reader(f) if row]
+    if len(header) < 6:
+        header = header + ["ID"] if len(header) == 5 else TRANSACTIONS_HEADER
+    transactions = [row if has_transaction_id(row) else row[:5] + [uuid.uuid4().hex]
+                    for row in rows[1:] if len(row) >= 5]
+
+    with open_for_writing(transactions_file, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(transactions)
+
+def compact_transactions():
+    """Rewrite the transactions file without deleted rows once tombstones pile up"""
+    tombstones = load_transaction_tombstones()
+    if len(tombstones) <= TOMBSTONE_COMPACTION_THRESHOLD:
+        return False
+
+    transactions_file = get_data_file_path("transactions_database.csv")
+    with open(transactions_file, 'r', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        transactions = [row for row in reader
+                        if len(row) >= 5 and (len(row) < 6 or row[5] not in tombstones)]
+
+    with open_for_writing(transactions_file, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
+        if header:
+            f.write(format_csv_row(header))
+        f.writelines(format_csv_row(row) for row in transactions)
+
+    # All tombstones have been applied
+    open_for_writing(get_data_file_path("transactions_tombstones.csv"), 'w').close()
+    return True
+
+def amount_to_cents(amount):
+    """Convert an amount in lira (text or number) to integer kuruş"""
+    return int(round(float(amount) * 100))
+
+def parse_transaction_dates(date_strings):
+    """Parse dd/mm/yyyy dates into a datetime64[D] array, NaT where invalid"""
+    try:
+        return np.array([f"{d[6:]}-{d[3:5]}-{d[:2]}" for d in date_strings], dtype="datetime64[D]")
+    except ValueError:
+        pass  # Some malformed date; parse one by one
+    
+    dates = []
+    for d in date_strings:
+        try:
+            dates.append(datetime.strptime(d, "%d/%m/%Y").date())
+        except ValueError:
+            dates.append("NaT")
+    return np.array(dates, dtype="datetime64[D]")
+
+def parse_amounts(amount_strings):
+    """Parse amounts into a float64 array, NaN where invalid"""
+    try:
+        return np.array(amount_strings, dtype=np.float64)
+    except ValueError:
+        pass  # Some malformed amount; parse one by one
+    
+    amounts = []
+    for amount in amount_strings:
+        try:
+            amounts.append(float(amount))
+        except ValueError:
+            amounts.append(np.nan)
+    return np.array(amounts, dtype=np.float64)
+
+def balance_recorded_for(balance_file_path, date_str):
+    """Check whether the balance file has a row for a date by scanning its raw bytes"""
+    with open(balance_file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return False  # Empty files can't be memory-mapped
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Rows look like "balance,dd/mm/yyyy", so the date is always preceded by a comma
+            needle = f",{date_str}".encode('utf-8')
+            position = mm.find(needle)
+            while position != -1:
+                end = position + len(needle)
+                if end == len(mm) or mm[end:end + 1] in (b'\r', b'\n'):
+                    return True
+                position = mm.find(needle, end)
+    return False
+
+# First field of a row in a labels/types file marking an earlier row as deleted
+COUNT_TOMBSTONE = "__DEL__"
+
+def get_count_files(flow_type):
+    """Get the labels and types files holding usage counts for a flow type"""
+    if flow_type == "Expense":
+        return get_data_file_path("expense_labels.csv"), get_data_file_path("expense_types.csv")
+    return get_data_file_path("income_labels.csv"), get_data_file_path("income_types.csv")
+
+class TransactionStore:
+    """In-memory copy of the transactions database, loaded once per session"""
+
+    def __init__(self, io_pool):
+        self.io_pool = io_pool  # Runs file rewrites off the UI thread
+        self._tx_file = None  # Append handle, opened on the first new transaction
+        self._rows_by_id = {}  # Transaction id -> row, in file (oldest first) order
+        self._arrays = None  # Column arrays for analytics, rebuilt after a change
+        self._categories = None  # Label and type codes for analytics, rebuilt after a change
+        
+        # Running totals in kuruş so repeated adds/deletes never drift
+        self._total_expense_cents = 0
+        self._total_income_cents = 0
+        
+        # Usage counts per file: {(type, label): count} and {type: count}
+        self.label_counts = {}
+        self.type_counts = {}
+        self._dirty_count_files = set()
+
+    def load(self):
+        """Read the transactions file and compute the running totals"""
+        try:
+            rows = read_transactions()
+            if not all(has_transaction_id(row) for row in rows):
+                # Id-less rows (e.g. hand-edited or restored files) get ids saved to the file
+                ensure_transaction_ids(check_rows=True)
+                rows = read_transactions()
+        except FileNotFoundError:
+            rows = []  # No transactions file yet
+        self._rows_by_id = {row[5]: row for row in rows}
+        self._arrays = None
+        self._categories = None
+        
+        # Totals in kuruş from the validated columns (rounded like amount_to_cents)
+        flows, _, amounts = self.arrays()
+        amount_cents = np.rint(amounts * 100).astype(np.int64)
+        self._total_expense_cents = int(amount_cents[flows == "Expense"].sum())
+        self._total_income_cents = int(amount_cents[flows == "Income"].sum())
+
+    def __iter__(self):
+        """Iterate over transactions, oldest first"""
+        return iter(self._rows_by_id.values())
+
+    def __len__(self):
+        return len(self._rows_by_id)
+
+    def newest_first(self):
+        """Iterate over transactions, newest (last added) first"""
+        return reversed(self._rows_by_id.values())
+
+    def arrays(self):
+        """Get (flows, dates, amounts) numpy columns of all transactions, cached until they change"""
+        if self._arrays is None:
+            rows = list(self._rows_by_id.values())
+            flows = np.array([row[0] for row in rows], dtype=str)
+            dates = parse_transaction_dates([row[4] for row in rows])
+            amounts = parse_amounts([row[2] for row in rows])
+            
+            # Validate once here: rows with an invalid amount get no flow (and amount 0),
+            # so they drop out of every per-flow filter without per-row checks later
+            invalid = np.isnan(amounts)
+            if invalid.any():
+                flows[invalid] = ""
+                amounts[invalid] = 0.0
+            self._arrays = (flows, dates, amounts)
+        return self._arrays
+
+    def categories(self):
+        """Get (label names, label codes, type names, type codes) of all transactions, cached until they change"""
+        # Codes index into the sorted unique names, like a categorical column
+        if self._categories is None:
+            rows = list(self._rows_by_id.values())
+            label_names, label_codes = np.unique(np.array([row[1] for row in rows], dtype=str), return_inverse=True)
+            type_names, type_codes = np.unique(np.array([row[3] for row in rows], dtype=str), return_inverse=True)
+            self._categories = (label_names, label_codes.ravel(), type_names, type_codes.ravel())
+        return self._categories
+
+    def _apply_to_totals(self, row, sign):
+        """Add (sign=1) or remove (sign=-1) a transaction from the running totals"""
+        try:
+            amount_cents = amount_to_cents(row[2])
+        except ValueError:
+            return  # Skip invalid transactions
+        
+        if row[0] == "Expense":
+            self._total_expense_cents += sign * amount_cents
+        elif row[0] == "Income":
+            self._total_income_cents += sign * amount_cents
+
+    def _open_transactions_file(self):
+        """Open the transactions file for appending and keep it open for the session"""
+        transactions_file = get_data_file_path("transactions_database.csv")
+        
+        # Check if file exists and ends with newline (only the last byte is read)
+        file_size = 0
+        file_needs_newline = False
+        try:
+            file_size = os.path.getsize(transactions_file)
+            if file_size:
+                with open(transactions_file, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    file_needs_newline = f.read(1) != b'\n'
+        except FileNotFoundError:
+            pass
+        
+        self._tx_file = open_for_writing(transactions_file, 'a', newline='', encoding='utf-8')
+        
+        if not file_size:
+            self._tx_file.write(format_csv_row(TRANSACTIONS_HEADER))
+        elif file_needs_newline:
+            self._tx_file.write('\r\n')
+
+    def append(self, row):
+        """Append a transaction to the CSV file and the in-memory rows"""
+        row = [str(value) for value in row]
+        
+        if self._tx_file is None:
+            self._open_transactions_file()
+        self._tx_file.write(format_csv_row(row))
+        self._tx_file.flush()
+        
+        self._rows_by_id[row[5]] = row
+        self._arrays = None
+        self._categories = None
+        self._apply_to_totals(row, 1)
+
+    def delete(self, transaction_id):
+        """Tombstone a transaction and drop it from the in-memory rows"""
+        append_transaction_tombstone(transaction_id)
+        row = self._rows_by_id.pop(transaction_id)
+        self._arrays = None
+        self._categories = None
+        self._apply_to_totals(row, -1)
+
+    def compact(self):
+        """Apply accumulated tombstones to the transactions file"""
+        self.close()  # Reopened on the next append
+        return compact_transactions()
+
+    def close(self):
+        """Close the transactions append handle"""
+        if self._tx_file is not None:
+            self._tx_file.close()
+            self._tx_file = None
+
+    def totals(self):
+        """Get total expenses and income over all transactions"""
+        return self._total_expense_cents / 100, self._total_income_cents / 100
+
+    def load_counts(self):
+        """Read the label and type usage counts of both flow types"""
+        for flow_type in ("Expense", "Income"):
+            labels_file, types_file = get_count_files(flow_type)
+            
+            # Create missing files once here so later reads and appends never have to
+            for filename in (labels_file, types_file):
+                open_for_writing(filename, 'a').close()
+            
+            rows = read_csv_rows(labels_file)
+            labels = {}
+            for row in rows:
+                if row[0] == COUNT_TOMBSTONE:
+                    labels.pop(tuple(row[1:3]), None)
+                elif len(row) >= 3:
+                    labels[(row[0], row[1])] = self._parse_count(row[2])
+            self.label_counts[labels_file] = labels
+            self._compact_counts_if_needed(labels_file, len(rows), len(labels))
+            
+            rows = read_csv_rows(types_file)
+            types = {}
+            for row in rows:
+                if row[0] == COUNT_TOMBSTONE:
+                    types.pop(row[1] if len(row) >= 2 else None, None)
+                elif len(row) >= 2:
+                    types[row[0]] = self._parse_count(row[1])
+            self.type_counts[types_file] = types
+            self._compact_counts_if_needed(types_file, len(rows), len(types))
+
+    def _compact_counts_if_needed(self, filename, row_count, live_count):
+        """Drop deleted rows with the next counts flush once they outnumber the live ones"""
+        if row_count > 2 * live_count:
+            self._dirty_count_files.add(filename)
+
+    def _parse_count(self, count):
+        """Parse a usage count, treating malformed values as 0"""
+        try:
+            return int(count)
+        except ValueError:
+            return 0
+
+    def count_table(self, filename):
+        """Get the in-memory usage counts backing a labels or types file"""
+        if filename in self.label_counts:
+            return self.label_counts[filename]
+        return self.type_counts[filename]
+
+    def bump_usage_counts(self, flow_type, label_name, type_name, delta):
+        """Change the usage count of a label and its type in memory"""
+        labels_file, types_file = get_count_files(flow_type)
+        
+        labels = self.label_counts[labels_file]
+        if (type_name, label_name) in labels:
+            labels[(type_name, label_name)] = max(0, labels[(type_name, label_name)] + delta)  # Don't go below 0
+            self._dirty_count_files.add(labels_file)
+        
+        types = self.type_counts[types_file]
+        if type_name in types:
+            types[type_name] = max(0, types[type_name] + delta)
+            self._dirty_count_files.add(types_file)
+
+    def delete_count_entries(self, filename, keys):
+        """Remove labels or types, appending tombstone rows instead of rewriting the file"""
+        table = self.count_table(filename)
+        rows = []
+        for key in keys:
+            del table[key]
+            rows.append([COUNT_TOMBSTONE, *key] if isinstance(key, tuple) else [COUNT_TOMBSTONE, key])
+        if rows:
+            self.io_pool.submit(write_csv_rows, filename, rows, 'a')
+
+    def write_counts(self, filename):
+        """Rewrite a labels or types file from its in-memory counts"""
+        # Snapshot the rows now; the file is written on the I/O thread
+        if filename in self.label_counts:
+            rows = [[type_name, label_name, str(count)]
+                    for (type_name, label_name), count in self.label_counts[filename].items()]
+        else:
+            rows = [[type_name, str(count)] for type_name, count in self.type_counts[filename].items()]
+        
+        self.io_pool.submit(write_csv_rows, filename, rows)
+        self._dirty_count_files.discard(filename)
+
+    def append_count_row(self, filename, row):
+        """Append a new label/type row, queued behind any pending rewrite of the file"""
+        self.io_pool.submit(write_csv_rows, filename, [row], 'a')
+
+    def flush_counts(self):
+        """Write every labels/types file whose counts changed since the last flush"""
+        for filename in list(self._dirty_count_files):
+            self.write_counts(filename)
+
+# Named Tk fonts, created once by create_named_fonts so widgets share them
+# instead of each parsing its own font tuple
+FONT_9 = "app-9"
+FONT_10 = "app-10"
+FONT_10_BOLD = "app-10-bold"
+FONT_10_ITALIC = "app-10-italic"
+FONT_11 = "app-11"
+FONT_11_BOLD = "app-11-bold"
+FONT_12 = "app-12"
+FONT_12_BOLD = "app-12-bold"
+FONT_12_ITALIC = "app-12-italic"
+FONT_14 = "app-14"
+FONT_16 = "app-16"
+FONT_18_BOLD = "app-18-bold"
+FONT_24 = "app-24"
+FONT_48_BOLD = "app-48-bold"
+
+NAMED_FONTS = {
+    FONT_9: ("Arial", 9),
+    FONT_10: ("Arial", 10),
+    FONT_10_BOLD: ("Arial", 10, "bold"),
+    FONT_10_ITALIC: ("Arial", 10, "italic"),
+    FONT_11: ("Arial", 11),
+    FONT_11_BOLD: ("Arial", 11, "bold"),
+    FONT_12: ("Arial", 12),
+    FONT_12_BOLD: ("Arial", 12, "bold"),
+    FONT_12_ITALIC: ("Arial", 12, "italic"),
+    FONT_14: ("Arial", 14),
+    FONT_16: ("Arial", 16),
+    FONT_18_BOLD: ("Arial", 18, "bold"),
+    FONT_24: ("Arial", 24),
+    FONT_48_BOLD: ("Arial", 48, "bold"),
+}
+
+def create_named_fonts(root):
+    """Create the app's named fonts; the returned objects must be kept alive"""
+    fonts = []
+    for name, (family, size, *style) in NAMED_FONTS.items():
+        fonts.append(tkfont.Font(root, name=name, family=family, size=size,
+                                 weight="bold" if "bold" in style else "normal",
+                                 slant="italic" if "italic" in style else "roman"))
+    return fonts
+
+class BudgetTrackerApp(tk.Tk):
     def __init__(self):
         super().__init__()
 
-        self.set_theme("clam")
+        # "clam" ships with Tk's ttk, no theme package needed
+        ttk.Style(self).theme_use("clam")
+        self.named_fonts = create_named_fonts(self)
 
         self.title("Gurgen Budget Tracker")
         self.geometry("700x500")
@@ -118,16 +655,33 @@ class BudgetTrackerApp(ThemedTk):
         self.main_area.grid_rowconfigure(0, weight=1)
         self.main_area.grid_columnconfigure(0, weight=1)
 
-        self.pages = {}
+        # Data files live in user_data; create it once here rather than on every path lookup
+        ensure_dir(USER_DATA_DIR)
+        
+        # Older transaction files have no id column
+        ensure_transaction_ids()
 
-        # Create and pack the pages
-        for PageClass in (Dashboard, Transactions, LabelsAndTypes, Analytics, Settings):
-            page = PageClass(self.main_area, self)
-            self.pages[PageClass.__name__] = page
-            page.grid(row=0, column=0, sticky="nsew")
+        # A single worker keeps background file writes in submission order
+        self.io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+        # Transactions are read from disk once and shared by all pages
+        self.store = TransactionStore(self.io_pool)
+        self.store.load()
+        self.store.load_counts()
+        self._counts_flush_after = None
+        
+        # Write pending usage counts before the window goes away
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        # Pages are created on first visit (see show_page)
+        self.pages = {}
+        self._page_classes = {
+            PageClass.__name__: PageClass
+            for PageClass in (Dashboard, Transactions, LabelsAndTypes, Analytics, Settings)
+        }
 
         # Add buttons to the toolbar
-        toolbar_label = ttk.Label(self.toolbar, text="Menu", font=("Arial", 16))
+        toolbar_label = ttk.Label(self.toolbar, text="Menu", font=FONT_16)
         toolbar_label.pack(pady=10)
 
         buttons = [
@@ -152,6 +706,20 @@ class BudgetTrackerApp(ThemedTk):
 
     def perform_startup_backup(self):
         """Perform backup if it's been more than an hour since last backup"""
+        # Drop deleted transactions from disk once enough have accumulated.
+        # This runs here, before any transaction can be added, so no append races the rewrite.
+        try:
+            if self.store.compact():
+                print("Transactions database compacted")
+        except Exception as e:
+            print(f"Compaction error: {e}")
+        
+        # Copy the data on the I/O thread so the window isn't blocked
+        # (the future lets closing the app skip a backup that hasn't started)
+        self._backup_future = self.io_pool.submit(self._run_backup)
+    
+    def _run_backup(self):
+        """Run the backup (on the I/O thread, so no widget access here)"""
         try:
             if backup_user_data():
                 print("Backup completed successfully")
@@ -172,23 +740,14 @@ class BudgetTrackerApp(ThemedTk):
         balance_file_path = get_data_file_path("balance_database.csv")
         
         try:
-            # Read existing balance records
-            existing_dates = set()
-            with open(balance_file_path, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                next(reader)  # Skip header
-                for row in reader:
-                    if len(row) >= 2:
-                        existing_dates.add(row[1])
-            
             # If yesterday's balance is not recorded, record current balance as yesterday's
-            if yesterday_str not in existing_dates:
+            if not balance_recorded_for(balance_file_path, yesterday_str):
                 # Calculate current balance
                 total_expenses, total_income = self.calculate_current_balance()
                 current_balance = total_income - total_expenses
                 
                 # Append yesterday's balance to the file
-                with open(balance_file_path, 'a', newline='', encoding='utf-8') as f:
+                with open_for_writing(balance_file_path, 'a', newline='', encoding='utf-8') as f:
                     writer = csv.writer(f)
                     writer.writerow([f"{current_balance:.1f}", yesterday_str])
                 
@@ -196,7 +755,7 @@ class BudgetTrackerApp(ThemedTk):
             
         except FileNotFoundError:
             # Create the file if it doesn't exist
-            with open(balance_file_path, 'w', newline='', encoding='utf-8') as f:
+            with open_for_writing(balance_file_path, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
                 writer.writerow(["Balance", "Date"])  # Header
                 
@@ -209,35 +768,40 @@ class BudgetTrackerApp(ThemedTk):
         except Exception as e:
             print(f"Error recording daily balance: {e}")
     
+    def schedule_counts_flush(self):
+        """Write changed usage counts to disk within a few seconds of a change"""
+        if self._counts_flush_after is None:
+            self._counts_flush_after = self.after(5000, self._flush_counts)
+
+    def _flush_counts(self):
+        """Write pending usage counts to disk"""
+        self._counts_flush_after = None
+        self.store.flush_counts()
+
+    def _on_close(self):
+        """Flush pending writes and close the app"""
+        if self._counts_flush_after is not None:
+            self.after_cancel(self._counts_flush_after)
+        self._flush_counts()
+        
+        # Skip the backup if it hasn't started yet; a running copy can't be interrupted,
+        # so hide the window rather than leave it frozen while queued writes finish
+        self._backup_future.cancel()
+        self.withdraw()
+        self.io_pool.shutdown(wait=True)
+        self.store.close()
+        self.destroy()
+
     def calculate_current_balance(self):
         """Calculate current total expenses and income"""
-        total_expenses = 0.0
-        total_income = 0.0
-        
-        try:
-            with open(get_data_file_path("transactions_database.csv"), 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                next(reader)  # Skip header
-                
-                for row in reader:
-                    if row and len(row) >= 5:
-                        try:
-                            flow_type = row[0]
-                            amount = float(row[2])
-                            
-                            if flow_type == "Expense":
-                                total_expenses += amount
-                            elif flow_type == "Income":
-                                total_income += amount
-                        except (ValueError, IndexError):
-                            continue  # Skip invalid transactions
-        except FileNotFoundError:
-            pass  # No transactions file yet
-        
-        return total_expenses, total_income
+        return self.store.totals()
 
     def show_page(self, page_name):
-        page = self.pages[page_name]
+        page = self.pages.get(page_name)
+        if page is None:
+            page = self._page_classes[page_name](self.main_area, self)
+            page.grid(row=0, column=0, sticky="nsew")
+            self.pages[page_name] = page
         page.tkraise()
         
         # Refresh dashboard balance when navigating to it
@@ -250,12 +814,16 @@ class Page(ttk.Frame):
         self.controller = controller
 
 class Dashboard(Page):
+    # Balance label colors
+    _POS = "darkgreen"
+    _NEG = "darkred"
+
     def __init__(self, parent, controller):
         super().__init__(parent, controller)
         self.controller = controller
         
         # Main title
-        title_label = ttk.Label(self, text="Dashboard", font=("Arial", 24))
+        title_label = ttk.Label(self, text="Dashboard", font=FONT_24)
         title_label.pack(pady=(20, 10))
         
         # Current Balance Section
@@ -272,12 +840,12 @@ class Dashboard(Page):
         
         # Balance label
         balance_title = ttk.Label(balance_frame, text="Current Balance", 
-                                font=("Arial", 18, "bold"))
+                                font=FONT_18_BOLD)
         balance_title.pack(pady=(0, 10))
         
         # Balance amount (big and prominent)
         self.balance_label = ttk.Label(balance_frame, text="₺0.00", 
-                                     font=("Arial", 48, "bold"))
+                                     font=FONT_48_BOLD)
         self.balance_label.pack(pady=10)
         
         # Separator line
@@ -290,48 +858,20 @@ class Dashboard(Page):
         total_expenses, total_income = self.calculate_all_time_totals()
         current_balance = total_income - total_expenses
         
-        # Update balance label
-        self.balance_label.config(text=f"₺{current_balance:.2f}")
-        
-        # Set color based on positive/negative balance
-        if current_balance >= 0:
-            self.balance_label.config(foreground="darkgreen")
-        else:
-            self.balance_label.config(foreground="darkred")
+        # Update balance label text and color (positive/negative) in one call
+        self.balance_label.config(text=f"₺{current_balance:.2f}",
+                                  foreground=self._POS if current_balance >= 0 else self._NEG)
     
     def calculate_all_time_totals(self):
         """Calculate total expenses and income from all transactions"""
-        total_expenses = 0.0
-        total_income = 0.0
-        
-        try:
-            with open(get_data_file_path("transactions_database.csv"), 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                next(reader)  # Skip header
-                
-                for row in reader:
-                    if row and len(row) >= 5:
-                        try:
-                            flow_type = row[0]
-                            amount = float(row[2])
-                            
-                            if flow_type == "Expense":
-                                total_expenses += amount
-                            elif flow_type == "Income":
-                                total_income += amount
-                        except (ValueError, IndexError):
-                            continue  # Skip invalid transactions
-        except FileNotFoundError:
-            pass  # No transactions file yet
-        
-        return total_expenses, total_income
+        return self.controller.store.totals()
 
 class Transactions(Page):
     def __init__(self, parent, controller):
         super().__init__(parent, controller)
         self.controller = controller
         
-        label = ttk.Label(self, text="Transactions Page", font=("Arial", 24))
+        label = ttk.Label(self, text="Transactions Page", font=FONT_24)
         label.pack(pady=20, padx=20)
 
         button_frame = ttk.Frame(self)
@@ -351,14 +891,14 @@ class Transactions(Page):
         transactions_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
 
         # Transactions list - using Text widget for better control
-        self.transactions_text = tk.Text(transactions_frame, font=("Arial", 10), wrap=tk.WORD, cursor="hand2")
+        self.transactions_text = tk.Text(transactions_frame, font=FONT_10, wrap=tk.WORD, cursor="hand2")
         self.transactions_text.pack(fill=tk.BOTH, expand=True, padx=(20, 5), pady=5)
 
         # Configure tags for formatting
         self.transactions_text.tag_configure("expense", foreground="red")
         self.transactions_text.tag_configure("income", foreground="green")
-        self.transactions_text.tag_configure("date", foreground="gray", font=("Arial", 9))
-        self.transactions_text.tag_configure("amount", font=("Arial", 10, "bold"))
+        self.transactions_text.tag_configure("date", foreground="gray", font=FONT_9)
+        self.transactions_text.tag_configure("amount", font=FONT_10_BOLD)
         self.transactions_text.tag_configure("selected", background="lightblue")
 
         # Store selection tracking
@@ -378,27 +918,15 @@ class Transactions(Page):
     def add_transaction(self, flow_type):
         """Add a new transaction (expense or income)"""
         # Determine which labels file to use
-        if flow_type == "Expense":
-            labels_file = get_data_file_path("expense_labels.csv")
-        else:
-            labels_file = get_data_file_path("income_labels.csv")
+        labels_file, _ = get_count_files(flow_type)
 
-        # Load available labels
+        # Load available labels (the store is current even while file writes are queued)
         available_labels = []
         label_to_type = {}
         
-        try:
-            with open(labels_file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if row and len(row) >= 3:
-                        type_name = row[0]
-                        label_name = row[1]
-                        available_labels.append(label_name)
-                        label_to_type[label_name] = type_name
-        except FileNotFoundError:
-            tk.messagebox.showwarning("No Labels", f"Please create some {flow_type.lower()} labels first.")
-            return
+        for type_name, label_name in self.controller.store.count_table(labels_file):
+            available_labels.append(label_name)
+            label_to_type[label_name] = type_name
 
         if not available_labels:
             tk.messagebox.showwarning("No Labels", f"Please create some {flow_type.lower()} labels first.")
@@ -418,25 +946,7 @@ class Transactions(Page):
 
         # Save to CSV
         try:
-            # Check if file exists and ends with newline
-            file_needs_newline = False
-            try:
-                with open(get_data_file_path("transactions_database.csv"), 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if content and not content.endswith('\n'):
-                        file_needs_newline = True
-            except FileNotFoundError:
-                pass
-            
-            # Add newline if needed
-            if file_needs_newline:
-                with open(get_data_file_path("transactions_database.csv"), 'a', encoding='utf-8') as f:
-                    f.write('\n')
-            
-            # Now append the new transaction
-            with open(get_data_file_path("transactions_database.csv"), 'a', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow([flow_type, label_name, amount, type_name, current_date])
+            self.controller.store.append([flow_type, label_name, amount, type_name, current_date, uuid.uuid4().hex])
             
             # Update usage counts for label and type
             self.update_usage_counts(flow_type, label_name, type_name)
@@ -465,7 +975,7 @@ class Transactions(Page):
         result = {'label': None, 'amount': None}
 
         # Label selection
-        ttk.Label(dialog, text="Select Label:", font=("Arial", 12)).pack(pady=5)
+        ttk.Label(dialog, text="Select Label:", font=FONT_12).pack(pady=5)
         
         label_listbox = tk.Listbox(dialog, selectmode=tk.SINGLE, height=8)
         label_listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
@@ -474,8 +984,8 @@ class Transactions(Page):
             label_listbox.insert(tk.END, label)
 
         # Amount input
-        ttk.Label(dialog, text="Amount (₺):", font=("Arial", 12)).pack(pady=(15, 5))
-        amount_entry = ttk.Entry(dialog, width=20, font=("Arial", 12))
+        ttk.Label(dialog, text="Amount (₺):", font=FONT_12).pack(pady=(15, 5))
+        amount_entry = ttk.Entry(dialog, width=20, font=FONT_12)
         amount_entry.pack(pady=5)
         amount_entry.focus()
 
@@ -526,48 +1036,55 @@ class Transactions(Page):
         return None
 
     def load_transactions(self):
-        """Load and display transactions from CSV"""
+        """Display transactions from the shared transaction store"""
         self.transactions_text.delete("1.0", tk.END)
 
-        try:
-            transactions = []
-            with open(get_data_file_path("transactions_database.csv"), 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                next(reader)  # Skip header
-                for row in reader:
-                    if row and len(row) >= 5:
-                        transactions.append(row)
+        # Simply reverse the list so newest (last added) appears first
+        transactions = list(self.controller.store.newest_first())
+        self.transactions = transactions
+        self._line_to_index = {}
 
-            # Simply reverse the list so newest (last added) appears first
-            transactions.reverse()
+        try:
 
             if not transactions:
                 # Add top padding with empty lines
                 self.transactions_text.insert(tk.END, "\n\n")
                 self.transactions_text.insert(tk.END, "    No transactions yet. Add your first transaction using the buttons above!")
             else:
-                # Add top padding with empty lines
-                self.transactions_text.insert(tk.END, "\n")
+                # Build the whole listing as one string and insert it with a single Tk call,
+                # collecting the tag ranges per tag to apply them in one tag_add each
+                parts = ["\n"]  # Top padding line
+                tag_ranges = {"date": [], "amount": [], "expense": [], "income": []}
                 
-                for i, (flow, label, amount, type_name, date) in enumerate(transactions):
-                    if i > 0:
-                        self.transactions_text.insert(tk.END, "\n")
+                for i, row in enumerate(transactions):
+                    flow, label, amount, type_name, date = row[:5]
                     
-                    # Add left padding with spaces and format: "Date - Label (Type) - ₺Amount [Flow]"
-                    self.transactions_text.insert(tk.END, "    ")  # Left padding
-                    self.transactions_text.insert(tk.END, f"{date}", "date")
-                    self.transactions_text.insert(tk.END, f" - {label} ({type_name}) - ")
-                    self.transactions_text.insert(tk.END, f"₺{amount}", "amount")
+                    # Transaction i sits on line 2 + 2i (padding line, then blank line between entries)
+                    line = 2 + 2 * i
+                    self._line_to_index[line] = i
                     
+                    # Format: "Date - Label (Type) - ₺Amount [Flow]" with left padding
+                    middle = f" - {label} ({type_name}) - "
+                    amount_text = f"₺{amount}"
                     flow_tag = "expense" if flow == "Expense" else "income"
                     flow_symbol = " [-]" if flow == "Expense" else " [+]"
-                    self.transactions_text.insert(tk.END, flow_symbol, flow_tag)
-                    self.transactions_text.insert(tk.END, "\n")
+                    
+                    date_end = 4 + len(date)
+                    amount_start = date_end + len(middle)
+                    amount_end = amount_start + len(amount_text)
+                    tag_ranges["date"] += (f"{line}.4", f"{line}.{date_end}")
+                    tag_ranges["amount"] += (f"{line}.{amount_start}", f"{line}.{amount_end}")
+                    tag_ranges[flow_tag] += (f"{line}.{amount_end}", f"{line}.{amount_end + len(flow_symbol)}")
+                    
+                    if i > 0:
+                        parts.append("\n")
+                    parts.append(f"    {date}{middle}{amount_text}{flow_symbol}\n")
+                
+                self.transactions_text.insert(tk.END, "".join(parts))
+                for tag, ranges in tag_ranges.items():
+                    if ranges:
+                        self.transactions_text.tag_add(tag, *ranges)
 
-        except FileNotFoundError:
-            # Add top padding with empty lines
-            self.transactions_text.insert(tk.END, "\n\n")
-            self.transactions_text.insert(tk.END, "    No transactions yet. Add your first transaction using the buttons above!")
         except Exception as e:
             self.transactions_text.insert(tk.END, f"    Error loading transactions: {e}")
 
@@ -577,8 +1094,6 @@ class Transactions(Page):
 
     def on_transaction_click(self, event):
         """Handle clicks on transaction text for selection."""
-        print("Click event fired!")  # Debug print
-        
         # Clear previous selection
         self.transactions_text.tag_remove("selected", "1.0", tk.END)
         
@@ -586,33 +1101,13 @@ class Transactions(Page):
         index = self.transactions_text.index(f"@{event.x},{event.y}")
         line_num = int(index.split('.')[0])
         
-        print(f"Clicked on line {line_num}")  # Debug print
-        
-        # Get the content of the line
-        line_start = f"{line_num}.0"
-        line_end = f"{line_num}.end"
-        line_content = self.transactions_text.get(line_start, line_end)
-        
-        print(f"Line content: '{line_content}'")  # Debug print
-        
-        # Check if this line contains transaction data (starts with 4 spaces and has content)
-        if line_content.strip() and line_content.startswith("    ") and " - " in line_content:
-            print("Valid transaction line selected")  # Debug print
-            self.transactions_text.tag_add("selected", line_start, line_end)
+        # Look up which transaction (if any) was rendered on this line
+        transaction_index = self._line_to_index.get(line_num)
+        if transaction_index is not None:
+            self.transactions_text.tag_add("selected", f"{line_num}.0", f"{line_num}.end")
             self.transactions_text.selected_line = line_num
-            
-            # Count how many transaction lines come before this one
-            transaction_count = 0
-            for i in range(2, line_num + 1):  # Start from line 2 (after top padding)
-                check_line = self.transactions_text.get(f"{i}.0", f"{i}.end")
-                if check_line.strip() and check_line.startswith("    ") and " - " in check_line:
-                    if i == line_num:
-                        self.selected_transaction_index = transaction_count
-                        print(f"Selected transaction index: {transaction_count}")  # Debug print
-                        break
-                    transaction_count += 1
+            self.selected_transaction_index = transaction_index
         else:
-            print("Invalid line selected")  # Debug print
             self.transactions_text.selected_line = None
             self.selected_transaction_index = None
 
@@ -628,36 +1123,15 @@ class Transactions(Page):
             return
         
         try:
-            # Read all transactions
-            transactions = []
-            with open(get_data_file_path("transactions_database.csv"), 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                header = next(reader)  # Save header
-                for row in reader:
-                    if row and len(row) >= 5:
-                        transactions.append(row)
-            
-            # Reverse to match display order
-            transactions.reverse()
-            
-            # Get the transaction to delete
-            if self.selected_transaction_index < len(transactions):
-                transaction_to_delete = transactions[self.selected_transaction_index]
+            # Transactions are kept in display order by load_transactions
+            if self.selected_transaction_index < len(self.transactions):
+                transaction_to_delete = self.transactions[self.selected_transaction_index]
                 flow_type = transaction_to_delete[0]
                 label_name = transaction_to_delete[1]
                 type_name = transaction_to_delete[3]
                 
-                # Remove the transaction from the list
-                del transactions[self.selected_transaction_index]
-                
-                # Reverse back to original order for saving
-                transactions.reverse()
-                
-                # Write back to file
-                with open(get_data_file_path("transactions_database.csv"), 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(header)  # Write header
-                    writer.writerows(transactions)
+                # Record the deletion instead of rewriting the whole file
+                self.controller.store.delete(transaction_to_delete[5])
                 
                 # Update usage counts (decrement)
                 self.decrement_usage_counts(flow_type, label_name, type_name)
@@ -673,149 +1147,30 @@ class Transactions(Page):
             tk.messagebox.showerror("Error", f"Error deleting transaction: {e}")
 
     def decrement_usage_counts(self, flow_type, label_name, type_name):
-        """Decrement usage counts for both label and type CSV files"""
-        # Determine file names based on flow type
-        if flow_type == "Expense":
-            labels_file = get_data_file_path("expense_labels.csv")
-            types_file = get_data_file_path("expense_types.csv")
-        else:
-            labels_file = get_data_file_path("income_labels.csv")
-            types_file = get_data_file_path("income_types.csv")
-        
-        # Decrement label count
-        self.decrement_label_count(labels_file, type_name, label_name)
-        
-        # Decrement type count
-        self.decrement_type_count(types_file, type_name)
-
-    def decrement_label_count(self, labels_file, type_name, label_name):
-        """Decrement the count for a specific label"""
-        try:
-            # Read all labels
-            labels = []
-            with open(labels_file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if row and len(row) >= 3:
-                        labels.append(row)
-            
-            # Find and update the specific label
-            for i, (row_type, row_label, count) in enumerate(labels):
-                if row_type == type_name and row_label == label_name:
-                    new_count = max(0, int(count) - 1)  # Don't go below 0
-                    labels[i] = [row_type, row_label, str(new_count)]
-                    break
-            
-            # Write back to file
-            with open(labels_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerows(labels)
-                
-        except Exception as e:
-            print(f"Error updating label count in {labels_file}: {e}")
-
-    def decrement_type_count(self, types_file, type_name):
-        """Decrement the count for a specific type"""
-        try:
-            # Read all types
-            types = []
-            with open(types_file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if row and len(row) >= 2:
-                        types.append(row)
-            
-            # Find and update the specific type
-            for i, (row_type, count) in enumerate(types):
-                if row_type == type_name:
-                    new_count = max(0, int(count) - 1)  # Don't go below 0
-                    types[i] = [row_type, str(new_count)]
-                    break
-            
-            # Write back to file
-            with open(types_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerows(types)
-                
-        except Exception as e:
-            print(f"Error updating type count in {types_file}: {e}")
+        """Decrement usage counts for both the label and its type"""
+        self.controller.store.bump_usage_counts(flow_type, label_name, type_name, -1)
+        self.controller.schedule_counts_flush()
 
     def update_usage_counts(self, flow_type, label_name, type_name):
-        """Update usage counts for both label and type CSV files"""
-        # Determine file names based on flow type
-        if flow_type == "Expense":
-            labels_file = get_data_file_path("expense_labels.csv")
-            types_file = get_data_file_path("expense_types.csv")
-        else:
-            labels_file = get_data_file_path("income_labels.csv")
-            types_file = get_data_file_path("income_types.csv")
-        
-        # Update label count
-        self.update_label_count(labels_file, type_name, label_name)
-        
-        # Update type count
-        self.update_type_count(types_file, type_name)
-
-    def update_label_count(self, labels_file, type_name, label_name):
-        """Update the count for a specific label"""
-        try:
-            # Read all labels
-            labels = []
-            with open(labels_file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if row and len(row) >= 3:
-                        labels.append(row)
-            
-            # Find and update the specific label
-            for i, (row_type, row_label, count) in enumerate(labels):
-                if row_type == type_name and row_label == label_name:
-                    labels[i] = [row_type, row_label, str(int(count) + 1)]
-                    break
-            
-            # Write back to file
-            with open(labels_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerows(labels)
-                
-        except Exception as e:
-            print(f"Error updating label count in {labels_file}: {e}")
-
-    def update_type_count(self, types_file, type_name):
-        """Update the count for a specific type"""
-        try:
-            # Read all types
-            types = []
-            with open(types_file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if row and len(row) >= 2:
-                        types.append(row)
-            
-            # Find and update the specific type
-            for i, (row_type, count) in enumerate(types):
-                if row_type == type_name:
-                    types[i] = [row_type, str(int(count) + 1)]
-                    break
-            
-            # Write back to file
-            with open(types_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerows(types)
-                
-        except Exception as e:
-            print(f"Error updating type count in {types_file}: {e}")
+        """Increment usage counts for both the label and its type"""
+        self.controller.store.bump_usage_counts(flow_type, label_name, type_name, 1)
+        self.controller.schedule_counts_flush()
 
 import csv
 import tkinter as tk
 from tkinter import ttk, simpledialog, messagebox
-from ttkthemes import ThemedTk
 from datetime import datetime
 
 class LabelsAndTypes(Page):
+    # Text widgets slow down with thousands of lines, so only the newest items are shown
+    MAX_DISPLAY_ROWS = 500
+
     def __init__(self, parent, controller):
         super().__init__(parent, controller)
         
+        # "New Label" dialog, built on first use
+        self._label_dialog = None
+        
         # Main frame for the page
         main_frame = ttk.Frame(self)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -845,29 +1200,30 @@ class LabelsAndTypes(Page):
         self.setup_list_ui(income_labels_frame, "Income Labels", get_data_file_path("income_labels.csv"))
         self.setup_list_ui(income_types_frame, "Income Types", get_data_file_path("income_types.csv"))
 
-    def setup_list_ui(self, parent_frame, title, filename):
+    def setup_list_ui(self, parent_frame, title, filename, max_rows=MAX_DISPLAY_ROWS):
         """Helper function to create the UI for a list of items."""
         # Configure the parent frame to expand properly
         parent_frame.grid_rowconfigure(1, weight=1)
         parent_frame.grid_columnconfigure(0, weight=1)
         
-        label = ttk.Label(parent_frame, text=title, font=("Arial", 14))
+        label = ttk.Label(parent_frame, text=title, font=FONT_14)
         label.grid(row=0, column=0, pady=5, sticky="ew")
 
         # Use Text widget instead of Listbox for rich text formatting
-        text_widget = tk.Text(parent_frame, font=("Arial", 10), height=12, wrap=tk.WORD, 
+        text_widget = tk.Text(parent_frame, font=FONT_10, height=12, wrap=tk.WORD, 
                              cursor="hand2", state=tk.DISABLED)
         text_widget.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
         
         # Configure tags for formatting
-        text_widget.tag_configure("normal", font=("Arial", 10))
-        text_widget.tag_configure("type", font=("Arial", 10, "italic"), foreground="gray")
+        text_widget.tag_configure("normal", font=FONT_10)
+        text_widget.tag_configure("type", font=FONT_10_ITALIC, foreground="gray")
         text_widget.tag_configure("selected", background="lightblue")
         
         # Add scrollbar
         scrollbar = ttk.Scrollbar(parent_frame, orient=tk.VERTICAL, command=text_widget.yview)
         scrollbar.grid(row=1, column=1, sticky="ns")
         text_widget.config(yscrollcommand=scrollbar.set)
+        text_widget.scrollbar = scrollbar
 
         # Button frame for New and Delete buttons
         button_frame = ttk.Frame(parent_frame)
@@ -881,6 +1237,13 @@ class LabelsAndTypes(Page):
 
         # Store selection tracking
         text_widget.selected_line = None
+        text_widget.selected_key = None
+        text_widget.line_to_key = {}
+        text_widget.max_rows = max_rows
+        
+        # Which kind of file the list shows, decided once instead of on every row
+        text_widget.is_label_file = "labels" in filename
+        text_widget.is_expense = "expense" in filename
         
         # Bind click events for selection
         text_widget.bind("<Button-1>", lambda e: self.on_text_click(text_widget, e))
@@ -900,81 +1263,83 @@ class LabelsAndTypes(Page):
         index = text_widget.index(f"@{event.x},{event.y}")
         line_num = int(index.split('.')[0])
         
-        # Get the content of the line
-        line_start = f"{line_num}.0"
-        line_end = f"{line_num}.end"
-        line_content = text_widget.get(line_start, line_end).strip()
-        
-        # Only select non-empty lines
-        if line_content:
-            text_widget.tag_add("selected", line_start, line_end)
+        # Only lines showing an item can be selected
+        key = text_widget.line_to_key.get(line_num)
+        if key is not None:
+            text_widget.tag_add("selected", f"{line_num}.0", f"{line_num}.end")
             text_widget.selected_line = line_num
         else:
             text_widget.selected_line = None
+        text_widget.selected_key = key
 
     def load_data(self, text_widget, filename):
         """Load data from a CSV file into a text widget."""
-        text_widget.config(state=tk.NORMAL)
+        # Detach the scrollbar while the content changes so it is only updated once
+        text_widget.config(state=tk.NORMAL, yscrollcommand="")
         text_widget.delete("1.0", tk.END)
         
-        try:
-            with open(filename, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                first_item = True
-                for row in reader:
-                    if row:
-                        # Add padding with empty line for top padding
-                        if first_item:
-                            text_widget.insert(tk.END, "\n")
-                            first_item = False
-                        
-                        # Check if this is a label file (contains "labels" in filename)
-                        if "labels" in filename and len(row) >= 3:
-                            # Format: type,label,count - display as "label (type) [count]"
-                            type_name = row[0]
-                            label_name = row[1]
-                            count = row[2]
-                            text_widget.insert(tk.END, f"    {label_name} ", "normal")
-                            text_widget.insert(tk.END, f"({type_name}) [{count}]", "type")
-                        elif len(row) >= 2:
-                            # For types: type,count - display as "type [count]"
-                            type_name = row[0]
-                            count = row[1]
-                            text_widget.insert(tk.END, f"    {type_name} ", "normal")
-                            text_widget.insert(tk.END, f"[{count}]", "type")
-                        else:
-                            # Fallback for old format
-                            text_widget.insert(tk.END, f"    {row[0]}", "normal")
-                        
-                        text_widget.insert(tk.END, "\n\n")  # Empty line after each item
-        except FileNotFoundError:
-            # Create the file if it doesn't exist
-            with open(filename, 'w', newline='', encoding='utf-8'):
-                pass
-        
-        text_widget.config(state=tk.DISABLED)
+        # Counts are kept in memory by the store and may be newer than the file.
+        # The text is built as one string and inserted with a single Tk call,
+        # then each tag is applied to all its ranges at once
+        items = list(self.controller.store.count_table(filename).items())
+        total_items = len(items)
+        if total_items > text_widget.max_rows:
+            items = items[-text_widget.max_rows:]  # The store still holds every item
+        
+        parts = []
+        normal_ranges = []
+        type_ranges = []
+        line_to_key = {}
+        is_label_file = text_widget.is_label_file
+        for i, (key, count) in enumerate(items):
+            if is_label_file:
+                # Format: type,label,count - display as "label (type) [count]"
+                type_name, label_name = key
+                name_text = f"    {label_name} "
+                detail_text = f"({type_name}) [{count}]"
+            else:
+                # For types: type,count - display as "type [count]"
+                name_text = f"    {key} "
+                detail_text = f"[{count}]"
+            
+            # Item i sits on line 2 + 2i (top padding line, then an empty line after each item)
+            line = 2 + 2 * i
+            line_to_key[line] = key
+            detail_end = len(name_text) + len(detail_text)
+            normal_ranges += (f"{line}.0", f"{line}.{len(name_text)}")
+            type_ranges += (f"{line}.{len(name_text)}", f"{line}.{detail_end}")
+            parts.append(f"{name_text}{detail_text}\n\n")
+        
+        if len(items) < total_items:
+            parts.append(f"    Showing the newest {len(items)} of {total_items}")
+            type_ranges += (f"{2 + 2 * len(items)}.0", f"{2 + 2 * len(items)}.end")
+        
+        if parts:
+            text_widget.insert(tk.END, "\n" + "".join(parts))
+            if normal_ranges:
+                text_widget.tag_add("normal", *normal_ranges)
+            text_widget.tag_add("type", *type_ranges)
+        
+        text_widget.config(state=tk.DISABLED, yscrollcommand=text_widget.scrollbar.set)
+        text_widget.see("1.0")
+        
+        # Remember which item each line shows, and reset the selection
+        text_widget.line_to_key = line_to_key
+        text_widget.selected_line = None
+        text_widget.selected_key = None
 
     def add_item(self, text_widget, filename):
         """Add a new item to the text widget and save it to the CSV file."""
         # Check if this is a label file
-        if "labels" in filename:
+        if text_widget.is_label_file:
             # Get the corresponding types file
-            if "expense" in filename:
+            if text_widget.is_expense:
                 types_filename = "expense_types.csv"
             else:
                 types_filename = "income_types.csv"
             
-            # Load available types
-            available_types = []
-            try:
-                with open(get_data_file_path(types_filename), 'r', newline='', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    for row in reader:
-                        if row and len(row) >= 1:
-                            available_types.append(row[0])  # Just get the type name, ignore count
-            except FileNotFoundError:
-                tk.messagebox.showwarning("No Types", f"Please create some types in {types_filename} first.")
-                return
+            # Load available types (the store is current even while file writes are queued)
+            available_types = list(self.controller.store.count_table(get_data_file_path(types_filename)))
             
             if not available_types:
                 tk.messagebox.showwarning("No Types", "Please create some types first.")
@@ -986,48 +1351,74 @@ class LabelsAndTypes(Page):
                 return
             
             item_name, selected_type = result
+            key = (selected_type, item_name)
             csv_data = [selected_type, item_name, "0"]  # Start with count of 0
         else:
             # For types, just ask for the item name
             item_name = simpledialog.askstring("New Type", "Enter the name of the new type:")
             if not item_name:
                 return
+            if _UNSAFE_CSV_RE.search(item_name):
+                tk.messagebox.showwarning("Invalid Name", "Names cannot contain commas, quotes or line breaks.")
+                return
             
+            key = item_name
             csv_data = [item_name, "0"]  # Start with count of 0
         
+        # An existing item keeps its count; appending a "0" row would reset it on the next load
+        count_table = self.controller.store.count_table(filename)
+        if key in count_table:
+            tk.messagebox.showwarning("Already Exists", f"'{item_name}' already exists.")
+            return
+        count_table[key] = 0
+        
         # Add to CSV file
-        try:
-            with open(filename, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(csv_data)
-        except Exception as e:
-            print(f"Error writing to {filename}: {e}")
+        self.controller.store.append_count_row(filename, csv_data)
         
         # Reload the display
         self.load_data(text_widget, filename)
 
     def show_label_dialog(self, available_types):
         """Show a combined dialog for entering label name and selecting type."""
+        # The dialog is built once and hidden between uses
+        if self._label_dialog is None:
+            self.build_label_dialog()
+        dialog = self._label_dialog
+        
+        # Reset the inputs for this use
+        self._label_dialog_types = available_types
+        self._label_dialog_result = None
+        self._label_name_entry.delete(0, tk.END)
+        self._label_type_listbox.delete(0, tk.END)
+        self._label_type_listbox.insert(tk.END, *available_types)
+        
+        dialog.deiconify()
+        dialog.grab_set()
+        self._label_name_entry.focus()
+        
+        # Wait for OK or Cancel
+        dialog.wait_variable(self._label_dialog_closed)
+        dialog.grab_release()
+        return self._label_dialog_result
+
+    def build_label_dialog(self):
+        """Create the (initially hidden) dialog used by show_label_dialog."""
         # Create a dialog
         dialog = tk.Toplevel()
+        dialog.withdraw()
         dialog.title("New Label")
         dialog.geometry("350x300")
         dialog.transient()
-        dialog.grab_set()
         
         # Center the dialog
-        dialog.update_idletasks()
         x = (dialog.winfo_screenwidth() // 2) - (350 // 2)
         y = (dialog.winfo_screenheight() // 2) - (300 // 2)
         dialog.geometry(f"350x300+{x}+{y}")
         
-        result = {'name': None, 'type': None}
-        
         # Label name input
         ttk.Label(dialog, text="Label Name:").pack(pady=5)
         name_entry = ttk.Entry(dialog, width=30)
         name_entry.pack(pady=5)
-        name_entry.focus()
         
         # Type selection
         ttk.Label(dialog, text="Select Type:").pack(pady=(15, 5))
@@ -1035,8 +1426,9 @@ class LabelsAndTypes(Page):
         listbox = tk.Listbox(dialog, selectmode=tk.SINGLE, height=8)
         listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
-        for type_name in available_types:
-            listbox.insert(tk.END, type_name)
+        def close():
+            dialog.withdraw()
+            self._label_dialog_closed.set(True)
         
         def on_ok():
             name = name_entry.get().strip()
@@ -1046,84 +1438,44 @@ class LabelsAndTypes(Page):
                 tk.messagebox.showwarning("Missing Name", "Please enter a label name.")
                 return
             
+            if _UNSAFE_CSV_RE.search(name):
+                tk.messagebox.showwarning("Invalid Name", "Names cannot contain commas, quotes or line breaks.")
+                return
+            
             if not selection:
                 tk.messagebox.showwarning("Missing Type", "Please select a type.")
                 return
             
-            result['name'] = name
-            result['type'] = available_types[selection[0]]
-            dialog.destroy()
-        
-        def on_cancel():
-            dialog.destroy()
+            self._label_dialog_result = (name, self._label_dialog_types[selection[0]])
+            close()
         
         # Buttons
         button_frame = ttk.Frame(dialog)
         button_frame.pack(pady=10)
         
         ttk.Button(button_frame, text="OK", command=on_ok).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Cancel", command=on_cancel).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=close).pack(side=tk.LEFT, padx=5)
         
-        # Bind Enter key to OK
+        # Bind Enter key to OK; closing the window cancels but keeps it for reuse
         dialog.bind('<Return>', lambda e: on_ok())
+        dialog.protocol("WM_DELETE_WINDOW", close)
         
-        # Wait for dialog to close
-        dialog.wait_window()
-        
-        if result['name'] and result['type']:
-            return (result['name'], result['type'])
-        return None
+        self._label_dialog = dialog
+        self._label_dialog_closed = tk.BooleanVar(dialog)
+        self._label_name_entry = name_entry
+        self._label_type_listbox = listbox
 
     def delete_item(self, text_widget, filename):
         """Delete the selected item from the text widget and CSV file."""
-        if not hasattr(text_widget, 'selected_line') or text_widget.selected_line is None:
+        # The selected key is (type, label) for labels and the type name for types
+        key = text_widget.selected_key
+        if key is None:
             tk.messagebox.showwarning("No Selection", "Please select an item to delete.")
             return
         
-        # Get the content of the selected line
-        line_start = f"{text_widget.selected_line}.0"
-        line_end = f"{text_widget.selected_line}.end"
-        line_content = text_widget.get(line_start, line_end).strip()
-        
-        if not line_content:
-            tk.messagebox.showwarning("Invalid Selection", "Please select a valid item to delete.")
-            return
-        
-        # Extract the actual item name for comparison
-        if "labels" in filename and "(" in line_content and ")" in line_content:
-            # For labels: extract label name from "    Label Name (Type Name) [Count]"
-            # Remove leading spaces first
-            item_text = line_content.strip()
-            actual_item_name = item_text.split(" (")[0]
-        elif "[" in line_content and "]" in line_content:
-            # For types: extract type name from "    Type Name [Count]"
-            item_text = line_content.strip()
-            actual_item_name = item_text.split(" [")[0]
-        else:
-            # Fallback: just remove padding
-            actual_item_name = line_content.strip()
-        
-        # Update the CSV file by rewriting it without the deleted item
+        # Remove the item (the CSV file gets a tombstone row, not a rewrite)
         try:
-            # Read all items except the one to delete
-            items = []
-            with open(filename, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if row:
-                        # For labels, compare the label name (second column)
-                        # For types, compare the type name (first column)
-                        if "labels" in filename:
-                            if len(row) >= 3 and row[1] != actual_item_name:
-                                items.append(row)
-                        else:
-                            if len(row) >= 2 and row[0] != actual_item_name:
-                                items.append(row)
-            
-            # Rewrite the file
-            with open(filename, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerows(items)
+            self.controller.store.delete_count_entries(filename, [key])
             
             # Reload the display
             self.load_data(text_widget, filename)
@@ -1132,10 +1484,40 @@ class LabelsAndTypes(Page):
             print(f"Error updating {filename}: {e}")
 
 
+class SectionState:
+    """Widgets and data of one Analytics section with numerical and graph views"""
+    __slots__ = ("rows", "tab_var", "numerical_btn", "graphs_btn", "subsection_frame",
+                 "numerical_frame", "graphs_frame", "bar_chart_frame", "pie_chart_frame",
+                 "charts", "data", "graphs_visible", "charts_dirty", "hover_afters")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, None)
+        self.data = []  # (name, percentage, total, daily average) of each shown row
+        self.graphs_visible = False
+        self.charts_dirty = True  # Data changed since the charts were last drawn
+        self.hover_afters = {}  # Chart kind -> id of its pending trailing hover call
+
+
 class Analytics(Page):
+    # Seconds between handled chart hover events (about 30 per second)
+    HOVER_INTERVAL = 0.033
+    
+    # Days covered by each time period, counting today ("All Time" has no limit)
+    PERIOD_DAYS = {"Today": 1, "Last 7 days": 7, "Last 30 days": 30, "Last 12 months": 365}
+
     def __init__(self, parent, controller):
         super().__init__(parent, controller)
         
+        # State of each section, by section id
+        self.sections = {}
+        
+        # Trend chart (figure, axes, canvas, no data label), created on first use
+        self.trend_chart = None
+        
+        # General Flow values last shown, by label
+        self._last_totals = {}
+        
         # Create a canvas and scrollbar for scrolling
         self.canvas = tk.Canvas(self)
         self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
@@ -1146,22 +1528,24 @@ class Analytics(Page):
             lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
         )
         
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
+        self._window_id = self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
         self.canvas.configure(yscrollcommand=self.scrollbar.set)
         
         # Pack scrollbar and canvas (scrollbar first to avoid overlap)
         self.scrollbar.pack(side="right", fill="y")
         self.canvas.pack(side="left", fill="both", expand=True)
         
-        # Bind mousewheel to canvas
-        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
-        self.bind_all("<MouseWheel>", self._on_mousewheel)
+        # Wheel events go to the widget under the pointer, so the handler is bound
+        # application-wide only while the pointer is over this page's canvas
+        self.canvas.bind("<Enter>", self._bind_mousewheel)
+        self.canvas.bind("<Leave>", self._unbind_mousewheel)
         
-        # Bind canvas resize to update scroll region
+        # Bind canvas resize to update scroll region (coalesced while dragging)
+        self._resize_after = None
         self.canvas.bind('<Configure>', self._on_canvas_configure)
         
         # Main title
-        title_label = ttk.Label(self.scrollable_frame, text="Analytics", font=("Arial", 24))
+        title_label = ttk.Label(self.scrollable_frame, text="Analytics", font=FONT_24)
         title_label.pack(pady=20)
         
         # General Flow section (includes its own time period selection)
@@ -1175,9 +1559,26 @@ class Analytics(Page):
     
     def _on_canvas_configure(self, event):
         """Handle canvas resize to update the scrollable frame width"""
-        # Update the scrollable frame width to match canvas width
-        canvas_width = event.width
-        self.canvas.itemconfig(self.canvas.find_all()[0], width=canvas_width)
+        # Update the scrollable frame width to match canvas width, at most once per frame
+        if self._resize_after is not None:
+            self.after_cancel(self._resize_after)
+        self._resize_after = self.after(16, self._apply_canvas_width, event.width)
+    
+    def _apply_canvas_width(self, canvas_width):
+        """Resize the scrollable frame to the latest canvas width"""
+        self._resize_after = None
+        self.canvas.itemconfig(self._window_id, width=canvas_width)
+    
+    def _bind_mousewheel(self, event):
+        """Scroll this page with the mouse wheel while the pointer is over it"""
+        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+    
+    def _unbind_mousewheel(self, event):
+        """Stop handling the mouse wheel once the pointer leaves the canvas"""
+        # Moving onto the page's content also leaves the canvas itself; keep the binding then
+        widget = self.winfo_containing(event.x_root, event.y_root)
+        if widget is None or not str(widget).startswith(str(self.canvas)):
+            self.canvas.unbind_all("<MouseWheel>")
     
     def _on_mousewheel(self, event):
         """Handle mouse wheel scrolling"""
@@ -1193,12 +1594,12 @@ class Analytics(Page):
         period_control_frame = ttk.Frame(flow_frame)
         period_control_frame.pack(fill=tk.X, padx=10, pady=(10, 15))
         
-        ttk.Label(period_control_frame, text="Time Period:", font=("Arial", 12, "bold")).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Label(period_control_frame, text="Time Period:", font=FONT_12_BOLD).pack(side=tk.LEFT, padx=(0, 10))
         
         self.period_var = tk.StringVar(value="All Time")
         period_options = ["Today", "Last 7 days", "Last 30 days", "Last 12 months", "All Time"]
         period_dropdown = ttk.Combobox(period_control_frame, textvariable=self.period_var, values=period_options, 
-                                     state="readonly", width=15, font=("Arial", 11))
+                                     state="readonly", width=15, font=FONT_11)
         period_dropdown.pack(side=tk.LEFT)
         period_dropdown.bind("<<ComboboxSelected>>", self.update_all_analytics)
         
@@ -1214,60 +1615,60 @@ class Analytics(Page):
         left_frame = ttk.Frame(analytics_frame)
         left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 20))
         
-        ttk.Label(left_frame, text="TOTALS", font=("Arial", 12, "bold")).pack(anchor="w", pady=(0, 10))
+        ttk.Label(left_frame, text="TOTALS", font=FONT_12_BOLD).pack(anchor="w", pady=(0, 10))
         
         # Total expenses
         self.total_expenses_frame = ttk.Frame(left_frame)
         self.total_expenses_frame.pack(fill=tk.X, pady=2)
-        ttk.Label(self.total_expenses_frame, text="Total Expenses:", font=("Arial", 11)).pack(side=tk.LEFT)
+        ttk.Label(self.total_expenses_frame, text="Total Expenses:", font=FONT_11).pack(side=tk.LEFT)
         self.total_expenses_label = ttk.Label(self.total_expenses_frame, text="₺0.00", 
-                                            font=("Arial", 11, "bold"), foreground="darkred")
+                                            font=FONT_11_BOLD, foreground="darkred")
         self.total_expenses_label.pack(side=tk.RIGHT)
         
         # Total income
         self.total_income_frame = ttk.Frame(left_frame)
         self.total_income_frame.pack(fill=tk.X, pady=2)
-        ttk.Label(self.total_income_frame, text="Total Income:", font=("Arial", 11)).pack(side=tk.LEFT)
+        ttk.Label(self.total_income_frame, text="Total Income:", font=FONT_11).pack(side=tk.LEFT)
         self.total_income_label = ttk.Label(self.total_income_frame, text="₺0.00", 
-                                          font=("Arial", 11, "bold"), foreground="darkgreen")
+                                          font=FONT_11_BOLD, foreground="darkgreen")
         self.total_income_label.pack(side=tk.RIGHT)
         
         # Total balance
         self.total_balance_frame = ttk.Frame(left_frame)
         self.total_balance_frame.pack(fill=tk.X, pady=2)
-        ttk.Label(self.total_balance_frame, text="Total Balance:", font=("Arial", 11)).pack(side=tk.LEFT)
+        ttk.Label(self.total_balance_frame, text="Total Balance:", font=FONT_11).pack(side=tk.LEFT)
         self.total_balance_label = ttk.Label(self.total_balance_frame, text="₺0.00", 
-                                           font=("Arial", 11, "bold"))
+                                           font=FONT_11_BOLD)
         self.total_balance_label.pack(side=tk.RIGHT)
         
         # Right column - Averages
         right_frame = ttk.Frame(analytics_frame)
         right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
         
-        ttk.Label(right_frame, text="DAILY AVERAGES", font=("Arial", 12, "bold")).pack(anchor="w", pady=(0, 10))
+        ttk.Label(right_frame, text="DAILY AVERAGES", font=FONT_12_BOLD).pack(anchor="w", pady=(0, 10))
         
         # Average daily expenses
         self.avg_expenses_frame = ttk.Frame(right_frame)
         self.avg_expenses_frame.pack(fill=tk.X, pady=2)
-        ttk.Label(self.avg_expenses_frame, text="Average Daily Expense:", font=("Arial", 11)).pack(side=tk.LEFT)
+        ttk.Label(self.avg_expenses_frame, text="Average Daily Expense:", font=FONT_11).pack(side=tk.LEFT)
         self.avg_expenses_label = ttk.Label(self.avg_expenses_frame, text="₺0.00", 
-                                          font=("Arial", 11, "bold"), foreground="darkred")
+                                          font=FONT_11_BOLD, foreground="darkred")
         self.avg_expenses_label.pack(side=tk.RIGHT)
         
         # Average daily income
         self.avg_income_frame = ttk.Frame(right_frame)
         self.avg_income_frame.pack(fill=tk.X, pady=2)
-        ttk.Label(self.avg_income_frame, text="Average Daily Income:", font=("Arial", 11)).pack(side=tk.LEFT)
+        ttk.Label(self.avg_income_frame, text="Average Daily Income:", font=FONT_11).pack(side=tk.LEFT)
         self.avg_income_label = ttk.Label(self.avg_income_frame, text="₺0.00", 
-                                        font=("Arial", 11, "bold"), foreground="darkgreen")
+                                        font=FONT_11_BOLD, foreground="darkgreen")
         self.avg_income_label.pack(side=tk.RIGHT)
         
         # Average daily balance
         self.avg_balance_frame = ttk.Frame(right_frame)
         self.avg_balance_frame.pack(fill=tk.X, pady=2)
-        ttk.Label(self.avg_balance_frame, text="Average Daily Balance:", font=("Arial", 11)).pack(side=tk.LEFT)
+        ttk.Label(self.avg_balance_frame, text="Average Daily Balance:", font=FONT_11).pack(side=tk.LEFT)
         self.avg_balance_label = ttk.Label(self.avg_balance_frame, text="₺0.00", 
-                                         font=("Arial", 11, "bold"))
+                                         font=FONT_11_BOLD)
         self.avg_balance_label.pack(side=tk.RIGHT)
         
         # Load initial data
@@ -1288,18 +1689,18 @@ class Analytics(Page):
         row1_frame.pack(fill=tk.X, pady=(0, 5))
         
         # Flow Type dropdown (Expenses/Incomes)
-        ttk.Label(row1_frame, text="Flow:", font=("Arial", 9)).pack(side=tk.LEFT, padx=(0, 3))
+        ttk.Label(row1_frame, text="Flow:", font=FONT_9).pack(side=tk.LEFT, padx=(0, 3))
         self.lt_flow_var = tk.StringVar(value="Expenses")
         flow_combo = ttk.Combobox(row1_frame, textvariable=self.lt_flow_var, 
-                                 values=["Expenses", "Incomes"], state="readonly", width=8, font=("Arial", 9))
+                                 values=["Expenses", "Incomes"], state="readonly", width=8, font=FONT_9)
         flow_combo.pack(side=tk.LEFT, padx=(0, 10))
         
         # Time Period dropdown (specific to this section)
-        ttk.Label(row1_frame, text="Period:", font=("Arial", 9)).pack(side=tk.LEFT, padx=(0, 3))
+        ttk.Label(row1_frame, text="Period:", font=FONT_9).pack(side=tk.LEFT, padx=(0, 3))
         self.lt_period_var = tk.StringVar(value="Last 7 days")
         period_combo = ttk.Combobox(row1_frame, textvariable=self.lt_period_var,
                                    values=["Today", "Last 7 days", "Last 30 days", "Last 12 months", "All time"],
-                                   state="readonly", width=12, font=("Arial", 9))
+                                   state="readonly", width=12, font=FONT_9)
         period_combo.pack(side=tk.LEFT)
         
         # Second row of controls
@@ -1307,17 +1708,17 @@ class Analytics(Page):
         row2_frame.pack(fill=tk.X)
         
         # Category dropdown (By label/By type)
-        ttk.Label(row2_frame, text="Category:", font=("Arial", 9)).pack(side=tk.LEFT, padx=(0, 3))
+        ttk.Label(row2_frame, text="Category:", font=FONT_9).pack(side=tk.LEFT, padx=(0, 3))
         self.lt_category_var = tk.StringVar(value="By label")
         category_combo = ttk.Combobox(row2_frame, textvariable=self.lt_category_var,
-                                     values=["By label", "By type"], state="readonly", width=8, font=("Arial", 9))
+                                     values=["By label", "By type"], state="readonly", width=8, font=FONT_9)
         category_combo.pack(side=tk.LEFT, padx=(0, 10))
         
         # View Type dropdown (Numerical/Graphs)
-        ttk.Label(row2_frame, text="View:", font=("Arial", 9)).pack(side=tk.LEFT, padx=(0, 3))
+        ttk.Label(row2_frame, text="View:", font=FONT_9).pack(side=tk.LEFT, padx=(0, 3))
         self.lt_view_var = tk.StringVar(value="Numerical")
         view_combo = ttk.Combobox(row2_frame, textvariable=self.lt_view_var,
-                                 values=["Numerical", "Graphs"], state="readonly", width=8, font=("Arial", 9))
+                                 values=["Numerical", "Graphs"], state="readonly", width=8, font=FONT_9)
         view_combo.pack(side=tk.LEFT)
         
         # Bind events to update when dropdowns change
@@ -1355,13 +1756,16 @@ class Analytics(Page):
             row_frame = ttk.Frame(self.lt_numerical_frame)
             row_frame.pack(fill=tk.X, pady=1)
             
-            label_text = ttk.Label(row_frame, text="", font=("Arial", 12))
+            # Texts are bound to variables so unchanged values can be skipped
+            name_var = tk.StringVar(value="")
+            label_text = ttk.Label(row_frame, textvariable=name_var, font=FONT_12)
             label_text.pack(side=tk.LEFT)
             
-            stats_text = ttk.Label(row_frame, text="", font=("Arial", 12))
+            stats_var = tk.StringVar(value="")
+            stats_text = ttk.Label(row_frame, textvariable=stats_var, font=FONT_12)
             stats_text.pack(side=tk.RIGHT)
             
-            self.lt_data_rows.append((label_text, stats_text))
+            self.lt_data_rows.append((label_text, stats_text, name_var, stats_var))
         
         # Create chart frame for graphs view
         self.create_labels_types_charts()
@@ -1377,13 +1781,16 @@ class Analytics(Page):
         chart_container.grid_columnconfigure(1, weight=1)
         chart_container.grid_rowconfigure(0, weight=1)
         
+        section = self.sections["lt"] = SectionState()
+        section.rows = self.lt_data_rows
+        
         # Left frame for bar chart
-        self.lt_bar_chart_frame = ttk.LabelFrame(chart_container, text="Bar Chart")
-        self.lt_bar_chart_frame.grid(row=0, column=0, sticky="nsew", padx=(0, 2), pady=0)
+        section.bar_chart_frame = ttk.LabelFrame(chart_container, text="Bar Chart")
+        section.bar_chart_frame.grid(row=0, column=0, sticky="nsew", padx=(0, 2), pady=0)
         
         # Right frame for pie chart
-        self.lt_pie_chart_frame = ttk.LabelFrame(chart_container, text="Pie Chart")
-        self.lt_pie_chart_frame.grid(row=0, column=1, sticky="nsew", padx=(2, 0), pady=0)
+        section.pie_chart_frame = ttk.LabelFrame(chart_container, text="Pie Chart")
+        section.pie_chart_frame.grid(row=0, column=1, sticky="nsew", padx=(2, 0), pady=0)
     
     def update_labels_types_display(self, event=None):
         """Update the labels & types display based on dropdown selections"""
@@ -1392,6 +1799,7 @@ class Analytics(Page):
         period = self.lt_period_var.get() 
         category = self.lt_category_var.get()
         view_type = self.lt_view_var.get()
+        self.sections["lt"].graphs_visible = view_type == "Graphs"
         
         # Handle frame height and visibility based on view type
         if view_type == "Numerical":
@@ -1410,166 +1818,45 @@ class Analytics(Page):
             # Set smaller fixed height for graphs to fit compact window
             self.lt_display_frame.config(height=200)
             self.lt_display_frame.pack_propagate(False)
-            
-            # Update charts
-            self.update_labels_types_charts()
-            return
         
-        # Get filtered transactions for the selected period
-        transactions = self.get_filtered_transactions_for_period(period)
-        days_in_period = self.get_days_in_period_for_selection(period, transactions)
+        # Get filtered transactions (as a mask over the store's column arrays)
+        _, dates, _ = self.controller.store.arrays()
+        in_period = self.get_filtered_transactions(period, dates)
+        days_in_period = self.get_days_in_period_for_selection(period, dates[in_period])
         
         # Calculate statistics based on selections
-        if category == "By label":
-            stats = self.calculate_label_stats(transactions, flow_type)
-        else:
-            stats = self.calculate_type_stats(transactions, flow_type)
+        label_stats, type_stats = self.calculate_all_stats(in_period)[
+            "Expense" if flow_type == "Expenses" else "Income"]
+        stats = label_stats if category == "By label" else type_stats
         
         # Update display color based on flow type
         color = "darkred" if flow_type == "Expenses" else "darkgreen"
         
-        # Update the numerical display
+        # Update the numerical display (this also keeps the rows' data for the charts)
         self.display_stats_in_lt_rows(stats, days_in_period, color)
-    
-    def get_filtered_transactions_for_period(self, period):
-        """Get transactions filtered by the selected time period for Labels & Types section"""
-        try:
-            with open(get_data_file_path("transactions_database.csv"), 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                next(reader)  # Skip header
-                all_transactions = [row for row in reader if row and len(row) >= 5]
-        except FileNotFoundError:
-            return []
-        
-        if period == "All time":
-            return all_transactions
-        
-        from datetime import datetime, timedelta
-        
-        # Calculate the cutoff date
-        today = datetime.now()
-        if period == "Today":
-            cutoff_date = today.replace(hour=0, minute=0, second=0, microsecond=0)
-        elif period == "Last 7 days":
-            cutoff_date = today - timedelta(days=7)
-        elif period == "Last 30 days":
-            cutoff_date = today - timedelta(days=30)
-        elif period == "Last 12 months":
-            cutoff_date = today - timedelta(days=365)
-        else:
-            return all_transactions
-        
-        # Filter transactions
-        filtered_transactions = []
-        for transaction in all_transactions:
-            try:
-                transaction_date = datetime.strptime(transaction[4], "%d/%m/%Y")
-                if transaction_date >= cutoff_date:
-                    filtered_transactions.append(transaction)
-            except (ValueError, IndexError):
-                continue
         
-        return filtered_transactions
+        # Only draws while the Graphs view is shown
+        self.update_labels_types_charts()
     
-    def get_days_in_period_for_selection(self, period, transactions):
-        """Calculate days in period for Labels & Types section"""
+    def get_days_in_period_for_selection(self, period, dates):
+        """Calculate days in period for Labels & Types section from the filtered transactions' dates"""
         if period == "Today":
             return 1
-        elif period == "Last 7 days":
-            return min(7, len(set(t[4] for t in transactions if len(t) >= 5)) or 1)
-        elif period == "Last 30 days":
-            return min(30, len(set(t[4] for t in transactions if len(t) >= 5)) or 1)
-        elif period == "Last 12 months":
-            return min(365, len(set(t[4] for t in transactions if len(t) >= 5)) or 1)
-        else:  # All time
-            unique_dates = set(t[4] for t in transactions if len(t) >= 5)
-            return len(unique_dates) if unique_dates else 1
+        
+        # Days with at least one transaction (invalid dates are NaT and not counted)
+        active_days = len(np.unique(dates[~np.isnat(dates)])) or 1
+        
+        # "All time" is not in the table and is not capped
+        return min(self.PERIOD_DAYS.get(period, active_days), active_days)
     
     def display_stats_in_lt_rows(self, stats, days_in_period, color):
         """Display statistics in the Labels & Types rows"""
-        # Clear all rows first
-        for label_widget, stats_widget in self.lt_data_rows:
-            label_widget.config(text="", foreground="black")
-            stats_widget.config(text="", foreground="black")
-        
-        # Fill rows with data
-        for i, (name, total, percentage) in enumerate(stats[:5]):  # Limit to 5 items
-            if i < len(self.lt_data_rows):
-                daily_avg = total / days_in_period if days_in_period > 0 else 0
-                
-                # Set label name
-                self.lt_data_rows[i][0].config(text=f"{i+1}. {name}", foreground=color)
-                
-                # Set statistics (percentage, total, daily average)
-                stats_text = f"{percentage:.1f}% | ₺{total:.2f} | ₺{daily_avg:.2f}/day"
-                self.lt_data_rows[i][1].config(text=stats_text, foreground=color)
+        self.display_stats_in_rows("lt", stats, days_in_period, color)
     
     def update_labels_types_charts(self):
         """Update charts for Labels & Types section"""
-        # Get current data
-        data = self.get_lt_section_data()
-        
-        # Clear previous charts
-        for widget in self.lt_bar_chart_frame.winfo_children():
-            widget.destroy()
-        for widget in self.lt_pie_chart_frame.winfo_children():
-            widget.destroy()
-        
-        if not data:
-            # Show no data message in both frames
-            no_data_bar = ttk.Label(self.lt_bar_chart_frame, text="No data available", 
-                                  font=("Arial", 10, "italic"), foreground="gray")
-            no_data_bar.pack(expand=True)
-            
-            no_data_pie = ttk.Label(self.lt_pie_chart_frame, text="No data available", 
-                                  font=("Arial", 10, "italic"), foreground="gray")
-            no_data_pie.pack(expand=True)
-            return
-        
-        # Get colors for items
-        colors = self.get_chart_colors(len(data))
-        
-        # Create bar chart - smaller size for compact window
-        bar_fig = Figure(figsize=(3, 2), dpi=80)
-        bar_ax = bar_fig.add_subplot(111)
-        bar_canvas = FigureCanvasTkAgg(bar_fig, self.lt_bar_chart_frame)
-        self.create_interactive_bar_chart(bar_ax, bar_canvas, data, colors)
-        
-        bar_canvas.draw()
-        bar_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        # Create pie chart - smaller size for compact window
-        pie_fig = Figure(figsize=(3, 2), dpi=80)
-        pie_ax = pie_fig.add_subplot(111)
-        pie_canvas = FigureCanvasTkAgg(pie_fig, self.lt_pie_chart_frame)
-        self.create_interactive_pie_chart(pie_ax, pie_canvas, data, colors)
-        
-        pie_canvas.draw()
-        pie_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-    
-    def get_lt_section_data(self):
-        """Get data for the Labels & Types section to create charts"""
-        data = []
-        
-        for label_widget, stats_widget in self.lt_data_rows:
-            label_text = label_widget.cget("text")
-            stats_text = stats_widget.cget("text")
-            
-            if label_text and stats_text:
-                # Extract percentage and amount from stats text (format: "X.X% | ₺Y.YY | ₺Z.ZZ/day")
-                try:
-                    # Remove the number prefix from label (e.g., "1. Food" -> "Food")
-                    clean_label = label_text.split('. ', 1)[1] if '. ' in label_text else label_text
-                    
-                    # Extract total amount
-                    amount_part = stats_text.split('₺')[1].split(' |')[0]
-                    amount = float(amount_part)
-                    
-                    data.append((clean_label, amount))
-                except (ValueError, IndexError):
-                    continue
-        
-        return data
+        # Smaller charts for the compact window
+        self.draw_section_charts("lt", figsize=(3, 2))
     
     def create_trend_analysis_section(self):
         """Create the Trend Analysis section with page-wide line chart"""
@@ -1582,18 +1869,18 @@ class Analytics(Page):
         trend_control_frame.pack(fill=tk.X, padx=10, pady=(10, 5))
         
         # Flow Type dropdown (Expenses/Incomes/Balance)
-        ttk.Label(trend_control_frame, text="Flow:", font=("Arial", 9)).pack(side=tk.LEFT, padx=(0, 3))
+        ttk.Label(trend_control_frame, text="Flow:", font=FONT_9).pack(side=tk.LEFT, padx=(0, 3))
         self.trend_flow_var = tk.StringVar(value="Expenses")
         trend_flow_combo = ttk.Combobox(trend_control_frame, textvariable=self.trend_flow_var, 
-                                       values=["Expenses", "Incomes", "Balance"], state="readonly", width=8, font=("Arial", 9))
+                                       values=["Expenses", "Incomes", "Balance"], state="readonly", width=8, font=FONT_9)
         trend_flow_combo.pack(side=tk.LEFT, padx=(0, 15))
         
         # Time Period dropdown
-        ttk.Label(trend_control_frame, text="Period:", font=("Arial", 9)).pack(side=tk.LEFT, padx=(0, 3))
+        ttk.Label(trend_control_frame, text="Period:", font=FONT_9).pack(side=tk.LEFT, padx=(0, 3))
         self.trend_period_var = tk.StringVar(value="Last 7 days")
         trend_period_combo = ttk.Combobox(trend_control_frame, textvariable=self.trend_period_var,
                                          values=["Last 7 days", "Last 30 days", "Last 12 months"],
-                                         state="readonly", width=12, font=("Arial", 9))
+                                         state="readonly", width=12, font=FONT_9)
         trend_period_combo.pack(side=tk.LEFT)
         
         # Bind events to update when dropdowns change
@@ -1617,85 +1904,63 @@ class Analytics(Page):
         flow_type = self.trend_flow_var.get()
         period = self.trend_period_var.get()
         
-        # Clear previous chart
-        for widget in self.trend_chart_frame.winfo_children():
-            widget.destroy()
-        
         # Get trend data
         trend_data = self.get_trend_data(flow_type, period)
         
+        # The figure and canvas are kept and redrawn rather than rebuilt
+        fig, ax, canvas, no_data_label = self.get_trend_chart()
+        
         if not trend_data:
             # Show no data message
-            no_data_label = ttk.Label(self.trend_chart_frame, text="No data available for the selected period", 
-                                    font=("Arial", 12, "italic"), foreground="gray")
+            canvas.get_tk_widget().pack_forget()
             no_data_label.pack(expand=True)
             return
         
         # Create line chart with gradient fill
+        no_data_label.pack_forget()
         self.create_trend_line_chart(trend_data, flow_type)
     
+    def get_trend_chart(self):
+        """Get the trend chart's figure, axes, canvas and no data label, creating them on first use"""
+        if self.trend_chart is None:
+            fig = Figure(figsize=(8, 2.2), dpi=80, facecolor='white')
+            ax = fig.add_subplot(111)
+            canvas = FigureCanvasTkAgg(fig, self.trend_chart_frame)
+            no_data_label = ttk.Label(self.trend_chart_frame, text="No data available for the selected period", 
+                                    font=FONT_12_ITALIC, foreground="gray")
+            self.trend_chart = (fig, ax, canvas, no_data_label)
+        return self.trend_chart
+    
     def get_trend_data(self, flow_type, period):
         """Get daily trend data for the specified flow type and period"""
         from datetime import datetime, timedelta
-        import collections
         
         # Calculate the period range
         today = datetime.now()
-        if period == "Last 7 days":
-            cutoff_date = today - timedelta(days=7)
-            days_range = 7
-        elif period == "Last 30 days":
-            cutoff_date = today - timedelta(days=30)
-            days_range = 30
-        elif period == "Last 12 months":
-            cutoff_date = today - timedelta(days=365)
-            days_range = 365
-        else:
+        days_range = self.PERIOD_DAYS.get(period)
+        if days_range is None:
             return []
+        cutoff_date = today - timedelta(days=days_range)
         
         # Handle Balance data differently from Expenses/Incomes
         if flow_type == "Balance":
             return self.get_balance_trend_data(cutoff_date, days_range, today)
         
-        # Handle Expenses/Incomes from transactions
-        try:
-            with open(get_data_file_path("transactions_database.csv"), 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                next(reader)  # Skip header
-                all_transactions = [row for row in reader if row and len(row) >= 5]
-        except FileNotFoundError:
-            return []
-        
-        # Filter transactions by flow type and period
+        # Handle Expenses/Incomes from the store's column arrays
+        flows, dates, amounts = self.controller.store.arrays()
         flow_filter = "Expense" if flow_type == "Expenses" else "Income"
-        filtered_transactions = []
-        
-        for transaction in all_transactions:
-            if len(transaction) >= 5 and transaction[0] == flow_filter:
-                try:
-                    transaction_date = datetime.strptime(transaction[4], "%d/%m/%Y")
-                    if transaction_date >= cutoff_date:
-                        filtered_transactions.append((transaction_date, float(transaction[2])))
-                except (ValueError, IndexError):
-                    continue
-        
-        # Group by date and sum amounts
-        daily_totals = collections.defaultdict(float)
-        for date, amount in filtered_transactions:
-            date_key = date.strftime("%Y-%m-%d")
-            daily_totals[date_key] += amount
         
-        # Create complete date range with zeros for missing dates
-        date_range = []
-        amounts = []
+        # Sum amounts per day of the range in one pass (day 0 is the first day shown;
+        # invalid dates are NaT and never compare as in range)
+        first_day = np.datetime64(today.date(), "D") - (days_range - 1)
+        day_index = (dates - first_day).astype(np.int64)
+        in_range = (flows == flow_filter) & (dates >= first_day) & (day_index < days_range)
+        daily_totals = np.bincount(day_index[in_range], weights=amounts[in_range], minlength=days_range)
         
-        for i in range(days_range):
-            date = today - timedelta(days=days_range - 1 - i)
-            date_key = date.strftime("%Y-%m-%d")
-            date_range.append(date.strftime("%d/%m"))
-            amounts.append(daily_totals.get(date_key, 0))
+        # Label every day of the range, days without transactions stay at zero
+        date_range = [(today - timedelta(days=days_range - 1 - i)).strftime("%d/%m") for i in range(days_range)]
         
-        return list(zip(date_range, amounts))
+        return list(zip(date_range, daily_totals.tolist()))
     
     def get_balance_trend_data(self, cutoff_date, days_range, today):
         """Get balance trend data from balance_database.csv"""
@@ -1703,7 +1968,7 @@ class Analytics(Page):
         import collections
         
         try:
-            with open(get_data_file_path("balance_database.csv"), 'r', newline='', encoding='utf-8') as f:
+            with open(get_data_file_path("balance_database.csv"), 'r', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
                 reader = csv.reader(f)
                 next(reader)  # Skip header
                 balance_records = []
@@ -1750,14 +2015,10 @@ class Analytics(Page):
         return list(zip(date_range, amounts))
     
     def create_trend_line_chart(self, trend_data, flow_type):
-        """Create a line chart with gradient fill for trend analysis"""
-        from matplotlib.figure import Figure
-        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-        import numpy as np
-        
-        # Create figure for the line chart
-        fig = Figure(figsize=(8, 2.2), dpi=80, facecolor='white')
-        ax = fig.add_subplot(111)
+        """Draw a line chart with gradient fill for trend analysis on the trend figure"""
+        # Reuse the figure for the line chart
+        fig, ax, canvas, _ = self.get_trend_chart()
+        ax.clear()
         
         # Extract dates and amounts
         dates, amounts = zip(*trend_data) if trend_data else ([], [])
@@ -1793,9 +2054,8 @@ class Analytics(Page):
         # Adjust layout to prevent label cutoff
         fig.tight_layout()
         
-        # Create canvas and add to frame
-        canvas = FigureCanvasTkAgg(fig, self.trend_chart_frame)
-        canvas.draw()
+        # Redraw canvas and show it in the frame
+        canvas.draw_idle()
         canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
     
     def create_tabbed_subsection(self, parent, title, section_id):
@@ -1804,15 +2064,16 @@ class Analytics(Page):
         title_frame = ttk.Frame(parent)
         title_frame.pack(fill=tk.X, pady=(0, 5))
         
-        ttk.Label(title_frame, text=title, font=("Arial", 12, "bold")).pack(side=tk.LEFT)
+        ttk.Label(title_frame, text=title, font=FONT_12_BOLD).pack(side=tk.LEFT)
         
         # Tab buttons
         tab_frame = ttk.Frame(title_frame)
         tab_frame.pack(side=tk.RIGHT)
         
+        section = self.sections[section_id] = SectionState()
+        
         # Create tab variable for this section
-        tab_var = tk.StringVar(value="numerical")
-        setattr(self, f"{section_id}_tab_var", tab_var)
+        section.tab_var = tk.StringVar(value="numerical")
         
         # Numerical tab button
         numerical_btn = ttk.Button(tab_frame, text="Numerical", 
@@ -1825,24 +2086,24 @@ class Analytics(Page):
         graphs_btn.pack(side=tk.LEFT)
         
         # Store tab buttons for styling
-        setattr(self, f"{section_id}_numerical_btn", numerical_btn)
-        setattr(self, f"{section_id}_graphs_btn", graphs_btn)
+        section.numerical_btn = numerical_btn
+        section.graphs_btn = graphs_btn
         
         # Content frame for this subsection (initially adaptable)
         subsection_frame = ttk.Frame(parent)
         subsection_frame.pack(fill=tk.X, pady=(0, 15))
         
         # Store reference to subsection frame for dynamic height control
-        setattr(self, f"{section_id}_subsection_frame", subsection_frame)
+        section.subsection_frame = subsection_frame
         
         # Numerical content frame
         numerical_frame = ttk.Frame(subsection_frame)
         numerical_frame.pack(fill=tk.BOTH, expand=True)
-        setattr(self, f"{section_id}_numerical_frame", numerical_frame)
+        section.numerical_frame = numerical_frame
         
         # Graphs content frame (hidden by default)
         graphs_frame = ttk.Frame(subsection_frame)
-        setattr(self, f"{section_id}_graphs_frame", graphs_frame)
+        section.graphs_frame = graphs_frame
         
         # Create 5 rows for numerical data
         rows = []
@@ -1850,16 +2111,18 @@ class Analytics(Page):
             row_frame = ttk.Frame(numerical_frame)
             row_frame.pack(fill=tk.X, pady=1)
             
-            label_text = ttk.Label(row_frame, text="", font=("Arial", 12))
+            name_var = tk.StringVar(value="")
+            label_text = ttk.Label(row_frame, textvariable=name_var, font=FONT_12)
             label_text.pack(side=tk.LEFT)
             
-            stats_text = ttk.Label(row_frame, text="", font=("Arial", 12))
+            stats_var = tk.StringVar(value="")
+            stats_text = ttk.Label(row_frame, textvariable=stats_var, font=FONT_12)
             stats_text.pack(side=tk.RIGHT)
             
-            rows.append((label_text, stats_text))
+            rows.append((label_text, stats_text, name_var, stats_var))
         
         # Store rows for this section
-        setattr(self, f"{section_id}_rows", rows)
+        section.rows = rows
         
         # Create chart frame for graphs tab
         self.create_chart_frame(graphs_frame, section_id)
@@ -1869,18 +2132,20 @@ class Analytics(Page):
     
     def switch_tab(self, section_id, tab_type):
         """Switch between numerical and graphs tabs for a section"""
+        section = self.sections[section_id]
+        
         # Update tab variable
-        tab_var = getattr(self, f"{section_id}_tab_var")
-        tab_var.set(tab_type)
+        section.tab_var.set(tab_type)
+        section.graphs_visible = tab_type == "graphs"
         
         # Get frames
-        numerical_frame = getattr(self, f"{section_id}_numerical_frame")
-        graphs_frame = getattr(self, f"{section_id}_graphs_frame")
-        subsection_frame = getattr(self, f"{section_id}_subsection_frame")
+        numerical_frame = section.numerical_frame
+        graphs_frame = section.graphs_frame
+        subsection_frame = section.subsection_frame
         
         # Get buttons
-        numerical_btn = getattr(self, f"{section_id}_numerical_btn")
-        graphs_btn = getattr(self, f"{section_id}_graphs_btn")
+        numerical_btn = section.numerical_btn
+        graphs_btn = section.graphs_btn
         
         if tab_type == "numerical":
             # Show numerical, hide graphs
@@ -1930,87 +2195,82 @@ class Analytics(Page):
         pie_chart_frame.grid(row=0, column=1, sticky="nsew", padx=(2, 0), pady=0)
         
         # Store references
-        setattr(self, f"{section_id}_bar_chart_frame", bar_chart_frame)
-        setattr(self, f"{section_id}_pie_chart_frame", pie_chart_frame)
+        section = self.sections[section_id]
+        section.bar_chart_frame = bar_chart_frame
+        section.pie_chart_frame = pie_chart_frame
         
-        # Create both charts
-        self.create_both_charts(section_id)
+        # The charts themselves are built on the first switch to the Graphs tab
     
     def create_both_charts(self, section_id):
         """Create both interactive bar and pie charts side by side"""
-        # Get data for this section
-        data = self.get_section_data(section_id)
+        self.draw_section_charts(section_id, figsize=(4, 2.5))
+    
+    def get_section_charts(self, section_id, figsize):
+        """Get a section's bar and pie chart axes and canvases, creating them on first use"""
+        section = self.sections[section_id]
+        charts = section.charts
+        if charts is None:
+            charts = {"handlers": []}
+            for kind, frame in (("bar", section.bar_chart_frame), ("pie", section.pie_chart_frame)):
+                fig = Figure(figsize=figsize, dpi=80)
+                ax = fig.add_subplot(111)
+                canvas = FigureCanvasTkAgg(fig, frame)
+                no_data = ttk.Label(frame, text="No data available", 
+                                  font=FONT_10_ITALIC, foreground="gray")
+                charts[kind] = (ax, canvas, no_data)
+            section.charts = charts
+        return charts
+    
+    def draw_section_charts(self, section_id, figsize):
+        """Redraw a section's bar and pie charts, reusing their figures"""
+        # Hidden charts are drawn when their view is shown; unchanged ones are left as is
+        section = self.sections[section_id]
+        if not (section.graphs_visible and section.charts_dirty):
+            return
+        section.charts_dirty = False
         
-        # Get chart frames
-        bar_frame = getattr(self, f"{section_id}_bar_chart_frame")
-        pie_frame = getattr(self, f"{section_id}_pie_chart_frame")
+        data = self.get_section_data(section_id)
+        charts = self.get_section_charts(section_id, figsize)
         
-        # Clear previous charts
-        for widget in bar_frame.winfo_children():
-            widget.destroy()
-        for widget in pie_frame.winfo_children():
-            widget.destroy()
+        # Drop the hover handlers of the previous plot, and any hover call they still have pending
+        for canvas, handler_id in charts["handlers"]:
+            canvas.mpl_disconnect(handler_id)
+        charts["handlers"] = []
+        for after_id in section.hover_afters.values():
+            self.after_cancel(after_id)
+        section.hover_afters.clear()
         
         if not data:
             # Show no data message in both frames
-            no_data_bar = ttk.Label(bar_frame, text="No data available", 
-                                  font=("Arial", 10, "italic"), foreground="gray")
-            no_data_bar.pack(expand=True)
-            
-            no_data_pie = ttk.Label(pie_frame, text="No data available", 
-                                  font=("Arial", 10, "italic"), foreground="gray")
-            no_data_pie.pack(expand=True)
+            for kind in ("bar", "pie"):
+                _, canvas, no_data = charts[kind]
+                canvas.get_tk_widget().pack_forget()
+                no_data.pack(expand=True)
             return
         
         # Get colors for items
         colors = self.get_chart_colors(len(data))
         
-        # Create interactive bar chart
-        bar_fig = Figure(figsize=(4, 2.5), dpi=80)
-        bar_ax = bar_fig.add_subplot(111)
-        bar_canvas = FigureCanvasTkAgg(bar_fig, bar_frame)
-        self.create_interactive_bar_chart(bar_ax, bar_canvas, data, colors)
+        # Bars and wedges are updated in place when their number is unchanged
+        bar_ax, bar_canvas, _ = charts["bar"]
+        handler_ids, charts["bar_plot"] = self.create_interactive_bar_chart(
+            bar_ax, bar_canvas, data, colors, charts.get("bar_plot"), section.hover_afters)
+        charts["handlers"] += [(bar_canvas, handler_id) for handler_id in handler_ids]
         
-        bar_canvas.draw()
-        bar_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        pie_ax, pie_canvas, _ = charts["pie"]
+        handler_ids, charts["pie_plot"] = self.create_interactive_pie_chart(
+            pie_ax, pie_canvas, data, colors, charts.get("pie_plot"), section.hover_afters)
+        charts["handlers"] += [(pie_canvas, handler_id) for handler_id in handler_ids]
         
-        # Create interactive pie chart
-        pie_fig = Figure(figsize=(4, 2.5), dpi=80)
-        pie_ax = pie_fig.add_subplot(111)
-        pie_canvas = FigureCanvasTkAgg(pie_fig, pie_frame)
-        self.create_interactive_pie_chart(pie_ax, pie_canvas, data, colors)
-        
-        pie_canvas.draw()
-        pie_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        for kind in ("bar", "pie"):
+            _, canvas, no_data = charts[kind]
+            no_data.pack_forget()
+            canvas.draw_idle()
+            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
     
     def get_section_data(self, section_id):
         """Get data for a specific section to create charts"""
-        rows = getattr(self, f"{section_id}_rows", [])
-        data = []
-        
-        for label_widget, stats_widget in rows:
-            label_text = label_widget.cget("text")
-            stats_text = stats_widget.cget("text")
-            
-            if label_text and stats_text:
-                # Extract percentage and amount from stats text (format: "X.X% | ₺Y.YY | ₺Z.ZZ/day")
-                try:
-                    # Remove the number prefix from label (e.g., "1. Food" -> "Food")
-                    clean_label = label_text.split('. ', 1)[1] if '. ' in label_text else label_text
-                    
-                    # Extract percentage
-                    percentage_str = stats_text.split('%')[0]
-                    percentage = float(percentage_str)
-                    
-                    # Extract total amount
-                    amount_part = stats_text.split('₺')[1].split(' |')[0]
-                    amount = float(amount_part)
-                    
-                    data.append((clean_label, amount))
-                except (ValueError, IndexError):
-                    continue
-        
-        return data
+        return [(name, total) for name, _, total, _ in self.sections[section_id].data]
     
     def get_chart_colors(self, num_colors):
         """Generate distinct colors for chart items"""
@@ -2020,424 +2280,451 @@ class Analytics(Page):
                      '#FF9FF3', '#54A0FF', '#5F27CD', '#00D2D3', '#FF9F43']
             return colors[:num_colors]
         else:
-            # Generate colors using matplotlib colormap for larger datasets
-            cmap = plt.cm.tab20
-            return [cmap(i / num_colors) for i in range(num_colors)]
+            # Generate colors using matplotlib colormap for larger datasets (one (N, 4) RGBA lookup)
+            return plt.cm.tab20(np.arange(num_colors) / num_colors)
+    
+    def attach_tooltip_blitter(self, ax, canvas, tooltip):
+        """Draw tooltip by blitting over a cached figure background; returns (refresh, handler_id)"""
+        tooltip.set_animated(True)
+        blit_state = {"background": None}
+        
+        def on_draw(event):
+            # Every full draw (including resizes) re-captures the background
+            blit_state["background"] = canvas.copy_from_bbox(ax.figure.bbox)
+            if tooltip.get_visible():
+                ax.draw_artist(tooltip)
+        
+        def refresh():
+            if blit_state["background"] is None:
+                canvas.draw_idle()
+                return
+            canvas.restore_region(blit_state["background"])
+            if tooltip.get_visible():
+                ax.draw_artist(tooltip)
+            canvas.blit(ax.figure.bbox)
+        
+        return refresh, canvas.mpl_connect('draw_event', on_draw)
+    
+    def throttle_hover(self, handle_hover, pending, key):
+        """Rate-limit a motion handler to one call per HOVER_INTERVAL, returning (on_hover, cancel)"""
+        # A trailing call's after id is kept in pending[key], so a chart redraw can cancel it
+        state = {"time": 0.0, "event": None}
+        
+        def run_latest():
+            pending.pop(key, None)
+            state["time"] = time.monotonic()
+            handle_hover(state["event"])
+        
+        def on_hover(event):
+            state["event"] = event
+            if key in pending:
+                return  # Already scheduled; it handles this (latest) event
+            wait = state["time"] + self.HOVER_INTERVAL - time.monotonic()
+            if wait <= 0:
+                run_latest()
+            else:
+                # Handle the last motion of the interval too, so the tooltip never goes stale
+                pending[key] = self.after(max(1, int(wait * 1000)), run_latest)
+        
+        def cancel():
+            after_id = pending.pop(key, None)
+            if after_id is not None:
+                self.after_cancel(after_id)
+        
+        return on_hover, cancel
     
-    def create_interactive_bar_chart(self, ax, canvas, data, colors):
-        """Create an interactive bar chart with hover tooltips"""
+    def create_interactive_bar_chart(self, ax, canvas, data, colors, plot=None, pending_hovers=None):
+        """Create an interactive bar chart with hover tooltips, or update the (bars, tooltip) of plot"""
         labels, values = zip(*data) if data else ([], [])
         
-        # Create bars with no labels or text
-        bars = ax.bar(range(len(labels)), values, color=colors)
+        if plot is not None and len(plot[0]) == len(values):
+            # Same number of bars: only their heights change
+            bars, tooltip = plot
+            for bar, value in zip(bars, values):
+                bar.set_height(value)
+            tooltip.set_visible(False)
+            ax.relim()
+            ax.autoscale_view()
+        else:
+            ax.clear()
+            
+            # Create bars with no labels or text
+            bars = ax.bar(range(len(labels)), values, color=colors)
+            
+            # Remove all text elements
+            ax.set_xticks([])
+            ax.set_yticks([])
+            ax.set_xlabel('')
+            ax.set_ylabel('')
+            ax.set_title('')
+            
+            # Remove spines for cleaner look
+            for spine in ax.spines.values():
+                spine.set_visible(False)
+            
+            # Create tooltip
+            tooltip = ax.annotate('', xy=(0, 0), xytext=(10, 10), 
+                                textcoords='offset points',
+                                bbox=dict(boxstyle='round,pad=0.5', fc='yellow', alpha=0.8),
+                                arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'),
+                                fontsize=9, visible=False)
+            
+            ax.figure.tight_layout()
         
-        # Remove all text elements
-        ax.set_xticks([])
-        ax.set_yticks([])
-        ax.set_xlabel('')
-        ax.set_ylabel('')
-        ax.set_title('')
+        refresh_tooltip, draw_handler_id = self.attach_tooltip_blitter(ax, canvas, tooltip)
         
-        # Remove spines for cleaner look
-        for spine in ax.spines.values():
-            spine.set_visible(False)
+        # Values are fixed for this chart, so work these out once rather than per motion event
+        total_value = sum(values)
+        max_value = max(values, default=0)
+        min_index = values.index(min(values)) if values else -1  # Index of smallest bar
         
-        # Create tooltip
-        tooltip = ax.annotate('', xy=(0, 0), xytext=(10, 10), 
-                            textcoords='offset points',
-                            bbox=dict(boxstyle='round,pad=0.5', fc='yellow', alpha=0.8),
-                            arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'),
-                            fontsize=9, visible=False)
+        # Last hovered bar and tooltip visibility, so motion inside one bar doesn't redraw
+        hover_state = {"idx": None, "visible": False}
         
-        def on_hover(event):
+        def hide_tooltip():
+            hover_state["idx"] = None
+            if hover_state["visible"]:
+                hover_state["visible"] = False
+                tooltip.set_visible(False)
+                refresh_tooltip()
+        
+        def handle_hover(event):
             if event.inaxes == ax:
-                for i, bar in enumerate(bars):
-                    if bar.contains(event)[0]:
-                        # Show tooltip with item info
-                        label = labels[i]
-                        value = values[i]
-                        percentage = (value / sum(values) * 100) if sum(values) > 0 else 0
-                        
-                        tooltip.set_text(f'{label}\n₺{value:.2f}\n{percentage:.1f}%')
-                        
-                        # Get bar properties
-                        bar_x = bar.get_x() + bar.get_width()/2
-                        bar_height = bar.get_height()
-                        max_value = max(values)
-                        min_value = min(values)
-                        
-                        # Find index of smallest bar
-                        min_index = values.index(min_value)
-                        
-                        # Check if this is the tallest bar (within 10% of max)
-                        is_tall_bar = bar_height >= max_value * 0.9
-                        
-                        # Check if this is the smallest bar by comparing indices
-                        is_smallest_bar = (i == min_index)
-                        
-                        # Set tooltip position
-                        tooltip.xy = (bar_x, bar_height if not is_tall_bar else 0)
-                        
-                        if is_smallest_bar:
-                            # Smallest bar: always position to the left
-                            if is_tall_bar:
-                                tooltip.xytext = (-80, -50)  # Left and down
-                            else:
-                                tooltip.xytext = (-80, 10)   # Left and up
-                        elif is_tall_bar:
-                            # Tallest bar (not smallest): position down
-                            tooltip.xytext = (10, -50)
-                        else:
-                            # Regular bars: position up and right (default)
-                            tooltip.xytext = (10, 10)
-                        
-                        tooltip.set_visible(True)
-                        canvas.draw_idle()
+                # Bar i spans x = i ± 0.4 (default width 0.8) and y = 0..value, so no path tests are needed
+                i = int(round(event.xdata))
+                if 0 <= i < len(values) and abs(event.xdata - i) <= 0.4 and 0 <= event.ydata <= values[i]:
+                    if i == hover_state["idx"]:
                         return
+                    
+                    # Show tooltip with item info
+                    bar = bars[i]
+                    label = labels[i]
+                    value = values[i]
+                    percentage = (value / total_value * 100) if total_value > 0 else 0
+                    
+                    tooltip.set_text(f'{label}\n₺{value:.2f}\n{percentage:.1f}%')
+                    
+                    # Get bar properties
+                    bar_x = bar.get_x() + bar.get_width()/2
+                    bar_height = bar.get_height()
+                    
+                    # Check if this is the tallest bar (within 10% of max)
+                    is_tall_bar = bar_height >= max_value * 0.9
+                    
+                    # Check if this is the smallest bar by comparing indices
+                    is_smallest_bar = (i == min_index)
+                    
+                    # Set tooltip position
+                    tooltip.xy = (bar_x, bar_height if not is_tall_bar else 0)
+                    
+                    if is_smallest_bar:
+                        # Smallest bar: always position to the left
+                        if is_tall_bar:
+                            tooltip.xytext = (-80, -50)  # Left and down
+                        else:
+                            tooltip.xytext = (-80, 10)   # Left and up
+                    elif is_tall_bar:
+                        # Tallest bar (not smallest): position down
+                        tooltip.xytext = (10, -50)
+                    else:
+                        # Regular bars: position up and right (default)
+                        tooltip.xytext = (10, 10)
+                    
+                    hover_state["idx"] = i
+                    hover_state["visible"] = True
+                    tooltip.set_visible(True)
+                    refresh_tooltip()
+                    return
                 
                 # Hide tooltip if not hovering over any bar
-                tooltip.set_visible(False)
-                canvas.draw_idle()
+                hide_tooltip()
         
-        def on_leave(event):
-            tooltip.set_visible(False)
-            canvas.draw_idle()
-        
-        # Connect events
-        canvas.mpl_connect('motion_notify_event', on_hover)
-        canvas.mpl_connect('axes_leave_event', on_leave)
+        # Motion events can arrive hundreds of times a second
+        on_hover, cancel_hover = self.throttle_hover(
+            handle_hover, {} if pending_hovers is None else pending_hovers, "bar")
         
-        ax.figure.tight_layout()
+        def on_leave(event):
+            cancel_hover()
+            hide_tooltip()
+        
+        # Connect events (the ids let a redraw disconnect them)
+        handler_ids = [draw_handler_id,
+                       canvas.mpl_connect('motion_notify_event', on_hover),
+                       canvas.mpl_connect('axes_leave_event', on_leave)]
+        return handler_ids, (bars, tooltip)
     
-    def create_interactive_pie_chart(self, ax, canvas, data, colors):
-        """Create an interactive pie chart with hover tooltips"""
+    def create_interactive_pie_chart(self, ax, canvas, data, colors, plot=None, pending_hovers=None):
+        """Create an interactive pie chart with hover tooltips, or update the (wedges, tooltip) of plot"""
         labels, values = zip(*data) if data else ([], [])
+        total_value = sum(values)
+        
+        # Wedges run counterclockwise from 90°; end angle of each, measured from the start
+        wedge_ends = np.cumsum(values) / total_value * 360 if total_value > 0 else np.zeros(len(values))
+        
+        if plot is not None and len(plot[0]) == len(values):
+            # Same number of wedges: only their angles change
+            wedges, tooltip = plot
+            start = 0
+            for wedge, end in zip(wedges, wedge_ends.tolist()):
+                wedge.set_theta1(90 + start)
+                wedge.set_theta2(90 + end)
+                start = end
+            tooltip.set_visible(False)
+        else:
+            ax.clear()
+            
+            # Create pie chart with no labels or text
+            wedges = ax.pie(values, colors=colors, startangle=90)[0]
+            
+            ax.set_title('')
+            
+            # Create tooltip
+            tooltip = ax.annotate('', xy=(0, 0), xytext=(10, 10), 
+                                textcoords='offset points',
+                                bbox=dict(boxstyle='round,pad=0.5', fc='yellow', alpha=0.8),
+                                arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'),
+                                fontsize=9, visible=False)
+        
+        refresh_tooltip, draw_handler_id = self.attach_tooltip_blitter(ax, canvas, tooltip)
+        
+        # Last hovered wedge and tooltip visibility, so motion inside one wedge doesn't redraw
+        hover_state = {"idx": None, "visible": False}
+        
+        def hide_tooltip():
+            hover_state["idx"] = None
+            if hover_state["visible"]:
+                hover_state["visible"] = False
+                tooltip.set_visible(False)
+                refresh_tooltip()
         
-        # Create pie chart with no labels or text
-        wedges = ax.pie(values, colors=colors, startangle=90)[0]
-        
-        ax.set_title('')
-        
-        # Create tooltip
-        tooltip = ax.annotate('', xy=(0, 0), xytext=(10, 10), 
-                            textcoords='offset points',
-                            bbox=dict(boxstyle='round,pad=0.5', fc='yellow', alpha=0.8),
-                            arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'),
-                            fontsize=9, visible=False)
-        
-        def on_hover(event):
+        def handle_hover(event):
             if event.inaxes == ax:
-                for i, wedge in enumerate(wedges):
-                    if wedge.contains(event)[0]:
-                        # Show tooltip with item info
-                        label = labels[i]
-                        value = values[i]
-                        percentage = (value / sum(values) * 100) if sum(values) > 0 else 0
-                        
-                        tooltip.set_text(f'{label}\n₺{value:.2f}\n{percentage:.1f}%')
-                        tooltip.xy = (event.xdata, event.ydata)
-                        tooltip.set_visible(True)
-                        canvas.draw_idle()
+                # Find the wedge from the pointer's radius and angle instead of path tests
+                x, y = event.xdata, event.ydata
+                angle = (np.degrees(np.arctan2(y, x)) - 90) % 360
+                i = min(int(np.searchsorted(wedge_ends, angle, side='right')), len(values) - 1)
+                if x * x + y * y <= 1 and total_value > 0:
+                    if i == hover_state["idx"]:
                         return
+                    
+                    # Show tooltip with item info
+                    label = labels[i]
+                    value = values[i]
+                    percentage = (value / total_value * 100) if total_value > 0 else 0
+                    
+                    tooltip.set_text(f'{label}\n₺{value:.2f}\n{percentage:.1f}%')
+                    tooltip.xy = (event.xdata, event.ydata)
+                    hover_state["idx"] = i
+                    hover_state["visible"] = True
+                    tooltip.set_visible(True)
+                    refresh_tooltip()
+                    return
                 
                 # Hide tooltip if not hovering over any wedge
-                tooltip.set_visible(False)
-                canvas.draw_idle()
+                hide_tooltip()
         
-        def on_leave(event):
-            tooltip.set_visible(False)
-            canvas.draw_idle()
+        # Motion events can arrive hundreds of times a second
+        on_hover, cancel_hover = self.throttle_hover(
+            handle_hover, {} if pending_hovers is None else pending_hovers, "pie")
         
-        # Connect events
-        canvas.mpl_connect('motion_notify_event', on_hover)
-        canvas.mpl_connect('axes_leave_event', on_leave)
+        def on_leave(event):
+            cancel_hover()
+            hide_tooltip()
+        
+        # Connect events (the ids let a redraw disconnect them)
+        handler_ids = [draw_handler_id,
+                       canvas.mpl_connect('motion_notify_event', on_hover),
+                       canvas.mpl_connect('axes_leave_event', on_leave)]
+        return handler_ids, (wedges, tooltip)
     
     def update_section_charts(self, section_id):
         """Update charts for a section when data changes"""
-        # Only update if charts tab is currently active
-        tab_var = getattr(self, f"{section_id}_tab_var")
-        if tab_var.get() == "graphs":
-            # Refresh both charts
-            self.create_both_charts(section_id)
+        # Only redraws if the charts tab is currently active
+        self.create_both_charts(section_id)
     
     def update_all_analytics(self, event=None):
         """Update all analytics based on selected time period"""
         self.update_general_flow()
         self.update_labels_types()
     
-    def update_general_flow(self):
-        """Update general flow analytics"""
-    
     def update_general_flow(self):
         """Update general flow analytics"""
         period = self.period_var.get()
         
-        # Get filtered transactions
-        transactions = self.get_filtered_transactions(period)
+        # Get filtered transactions (as a mask over the store's column arrays)
+        flows, dates, amounts = self.controller.store.arrays()
+        in_period = self.get_filtered_transactions(period, dates)
         
         # Calculate metrics
-        total_expenses, total_income = self.calculate_totals(transactions)
+        total_expenses, total_income = self.calculate_totals(flows[in_period], amounts[in_period])
         total_balance = total_income - total_expenses
         
         # Calculate averages
-        days_in_period = self.get_days_in_period(period, transactions)
+        days_in_period = self.get_days_in_period(period, dates, in_period)
         avg_expenses = total_expenses / days_in_period if days_in_period > 0 else 0
         avg_income = total_income / days_in_period if days_in_period > 0 else 0
         avg_balance = total_balance / days_in_period if days_in_period > 0 else 0
         
-        # Update labels
-        self.total_expenses_label.config(text=f"₺{total_expenses:.2f}")
-        self.total_income_label.config(text=f"₺{total_income:.2f}")
-        self.total_balance_label.config(text=f"₺{total_balance:.2f}")
-        
-        self.avg_expenses_label.config(text=f"₺{avg_expenses:.2f}")
-        self.avg_income_label.config(text=f"₺{avg_income:.2f}")
-        self.avg_balance_label.config(text=f"₺{avg_balance:.2f}")
-        
-        # Update balance colors based on positive/negative
-        balance_color = "darkgreen" if total_balance >= 0 else "darkred"
-        self.total_balance_label.config(foreground=balance_color)
-        
-        avg_balance_color = "darkgreen" if avg_balance >= 0 else "darkred"
-        self.avg_balance_label.config(foreground=avg_balance_color)
+        # Update labels, configuring only those whose value changed since the last update
+        new_totals = {
+            self.total_expenses_label: total_expenses,
+            self.total_income_label: total_income,
+            self.total_balance_label: total_balance,
+            self.avg_expenses_label: avg_expenses,
+            self.avg_income_label: avg_income,
+            self.avg_balance_label: avg_balance,
+        }
+        for label, value in new_totals.items():
+            if self._last_totals.get(label) != value:
+                options = {"text": f"₺{value:.2f}"}
+                
+                # Balance labels are colored by sign
+                if label is self.total_balance_label or label is self.avg_balance_label:
+                    options["foreground"] = "darkgreen" if value >= 0 else "darkred"
+                label.config(**options)
+                self._last_totals[label] = value
     
     def update_labels_types(self):
         """Update labels & types analytics - now handled by new dropdown interface"""
         # This method is now handled by update_labels_types_display
         self.update_labels_types_display()
     
-    def calculate_label_stats(self, transactions, flow_type):
-        """Calculate statistics by label for the given flow type"""
-        # Filter transactions by flow type (flow_type is "Expenses" or "Incomes", CSV has "Expense" or "Income")
-        flow_filter = "Expense" if flow_type == "Expenses" else "Income"
-        filtered_transactions = [t for t in transactions if len(t) >= 5 and t[0] == flow_filter]
-        
-        # Get label statistics
-        label_totals = {}
-        for transaction in filtered_transactions:
-            try:
-                amount = float(transaction[2])
-                label = transaction[1] if len(transaction) > 1 else "Unknown"
-                label_totals[label] = label_totals.get(label, 0) + amount
-            except (ValueError, IndexError):
-                continue
-        
-        # Calculate total for percentages
-        total_amount = sum(label_totals.values())
-        
-        # Convert to list with percentages and sort by amount
-        stats = []
-        for label, amount in label_totals.items():
-            percentage = (amount / total_amount * 100) if total_amount > 0 else 0
-            stats.append((label, amount, percentage))
-        
-        # Sort by amount (descending)
-        stats.sort(key=lambda x: x[1], reverse=True)
-        
-        return stats
+    def calculate_all_stats(self, in_period):
+        """Calculate {flow: (label stats, type stats)} for both flow types over the transactions in in_period"""
+        # Group the store's cached label and type codes rather than the rows' strings
+        store = self.controller.store
+        flows, _, amounts = store.arrays()
+        label_names, label_codes, type_names, type_codes = store.categories()
+        
+        all_stats = {}
+        for flow in ("Expense", "Income"):
+            selected = in_period & (flows == flow)
+            all_stats[flow] = (
+                self.calculate_group_stats(label_names, label_codes[selected], amounts[selected]),
+                self.calculate_group_stats(type_names, type_codes[selected], amounts[selected]))
+        return all_stats
     
-    def calculate_type_stats(self, transactions, flow_type):
-        """Calculate statistics by type for the given flow type"""
-        # Filter transactions by flow type (flow_type is "Expenses" or "Incomes", CSV has "Expense" or "Income")
-        flow_filter = "Expense" if flow_type == "Expenses" else "Income"
-        filtered_transactions = [t for t in transactions if len(t) >= 5 and t[0] == flow_filter]
+    def calculate_group_stats(self, names, codes, amounts, top=5):
+        """Calculate (name, amount, percentage) stats of the top names, summing the amounts per name code"""
+        totals = np.bincount(codes, weights=amounts, minlength=len(names))
         
-        # Calculate type totals
-        type_totals = {}
-        for transaction in filtered_transactions:
-            try:
-                amount = float(transaction[2])
-                type_name = transaction[3] if len(transaction) > 3 else "Unknown"
-                type_totals[type_name] = type_totals.get(type_name, 0) + amount
-            except (ValueError, IndexError):
-                continue
+        # Keep only names with transactions in the selection, in the order they first appear
+        # there (codes follow the alphabetical order of the names), so equal amounts keep it
+        present_codes, first_seen = np.unique(codes, return_index=True)
+        present_codes = present_codes[np.argsort(first_seen, kind="stable")]
+        names, totals = names[present_codes], totals[present_codes]
         
         # Calculate total for percentages
-        total_amount = sum(type_totals.values())
+        total_amount = float(totals.sum())
+        
+        # Only the top rows are shown, so select them instead of sorting every name
+        largest = heapq.nlargest(top, zip(names.tolist(), totals.tolist()), key=lambda x: x[1])
         
-        # Convert to list with percentages and sort by amount
+        # Add percentages, keeping the order by amount (descending)
         stats = []
-        for type_name, amount in type_totals.items():
+        for name, amount in largest:
             percentage = (amount / total_amount * 100) if total_amount > 0 else 0
-            stats.append((type_name, amount, percentage))
-        
-        # Sort by amount (descending)
-        stats.sort(key=lambda x: x[1], reverse=True)
+            stats.append((name, amount, percentage))
         
         return stats
     
     def get_label_type_mapping(self, flow_type):
         """Get mapping from labels to types based on CSV files"""
-        mapping = {}
-        
-        try:
-            if flow_type == "Expenses":
-                # Read expense_labels.csv
-                with open(get_data_file_path("expense_labels.csv"), 'r', newline='', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    for row in reader:
-                        if len(row) >= 2:
-                            label = row[0]
-                            type_name = row[1]
-                            mapping[label] = type_name
-            else:
-                # Read income_labels.csv
-                with open(get_data_file_path("income_labels.csv"), 'r', newline='', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    for row in reader:
-                        if len(row) >= 2:
-                            label = row[0]
-                            type_name = row[1]
-                            mapping[label] = type_name
-        except FileNotFoundError:
-            pass  # Return empty mapping if file doesn't exist
-        
-        return mapping
+        # Label files hold type,label,count rows, already loaded by the store
+        labels_file, _ = get_count_files("Expense" if flow_type == "Expenses" else "Income")
+        return {label: type_name for type_name, label in self.controller.store.count_table(labels_file)}
     
-    def display_stats_in_rows(self, rows, stats, days_in_period, color):
+    def display_stats_in_rows(self, section_id, stats, days_in_period, color):
         """Display statistics in the allocated rows"""
-        # Clear all rows first
-        for label_widget, stats_widget in rows:
-            label_widget.config(text="", foreground="black")
-            stats_widget.config(text="", foreground="black")
-        
-        # Fill rows with data
-        for i, (name, total, percentage) in enumerate(stats[:5]):  # Limit to 5 items
-            if i < len(rows):
-                daily_avg = total / days_in_period if days_in_period > 0 else 0
-                
-                # Set label name
-                rows[i][0].config(text=f"{i+1}. {name}", foreground=color)
-                
-                # Set statistics (percentage, total, daily average)
-                stats_text = f"{percentage:.1f}% | ₺{total:.2f} | ₺{daily_avg:.2f}/day"
-                rows[i][1].config(text=stats_text, foreground=color)
-    
-    def get_filtered_transactions(self, period):
-        """Get transactions filtered by the selected time period"""
-        try:
-            with open(get_data_file_path("transactions_database.csv"), 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                next(reader)  # Skip header
-                all_transactions = [row for row in reader if row and len(row) >= 5]
-        except FileNotFoundError:
-            return []
-        
-        if period == "All Time":
-            return all_transactions
+        section = self.sections[section_id]
+        rows = section.rows
+        shown = min(len(stats), len(rows))  # Top 5 items
         
-        # Get current date and calculate cutoff date
-        current_date = datetime.now()
+        # Raw (name, percentage, total, daily average) of each shown row, read by the charts
+        previous_data = section.data
+        data = section.data = []
         
-        if period == "Today":
-            cutoff_date = current_date.replace(hour=0, minute=0, second=0, microsecond=0)
-        elif period == "Last 7 days":
-            cutoff_date = current_date - timedelta(days=7)
-        elif period == "Last 30 days":
-            cutoff_date = current_date - timedelta(days=30)
-        elif period == "Last 12 months":
-            cutoff_date = current_date - timedelta(days=365)
-        else:
-            return all_transactions
+        # Fill rows with data
+        for i in range(shown):
+            name, total, percentage = stats[i]
+            daily_avg = total / days_in_period if days_in_period > 0 else 0
+            data.append((name, percentage, total, daily_avg))
+            
+            # Set label name and statistics (percentage, total, daily average)
+            self.set_stats_row(rows[i], f"{i+1}. {name}",
+                               f"{percentage:.1f}% | ₺{total:.2f} | ₺{daily_avg:.2f}/day", color)
         
-        # Filter transactions
-        filtered = []
-        for transaction in all_transactions:
-            try:
-                transaction_date = datetime.strptime(transaction[4], "%d/%m/%Y")
-                if transaction_date >= cutoff_date:
-                    filtered.append(transaction)
-            except ValueError:
-                continue  # Skip transactions with invalid dates
+        # Clear the remaining rows
+        for row in rows[shown:]:
+            self.set_stats_row(row, "", "", "black")
         
-        return filtered
+        # Charts only need redrawing when the data actually changed
+        if data != previous_data:
+            section.charts_dirty = True
     
-    def calculate_totals(self, transactions):
-        """Calculate total expenses and income from transactions"""
-        total_expenses = 0.0
-        total_income = 0.0
-        
-        for transaction in transactions:
-            try:
-                flow_type = transaction[0]
-                amount = float(transaction[2])
-                
-                if flow_type == "Expense":
-                    total_expenses += amount
-                elif flow_type == "Income":
-                    total_income += amount
-            except (ValueError, IndexError):
-                continue  # Skip invalid transactions
-        
+    def set_stats_row(self, row, name_text, stats_text, color):
+        """Set a stats row's texts and color, leaving unchanged values alone"""
+        label_widget, stats_widget, name_var, stats_var = row
+        if name_var.get() != name_text:
+            name_var.set(name_text)
+        if stats_var.get() != stats_text:
+            stats_var.set(stats_text)
+        if str(label_widget.cget("foreground")) != color:
+            label_widget.config(foreground=color)
+            stats_widget.config(foreground=color)
+    
+    def get_filtered_transactions(self, period, dates):
+        """Get a mask of the transactions within the selected time period"""
+        period_days = self.PERIOD_DAYS.get(period)
+        if period_days is None:  # All Time
+            return np.ones(len(dates), dtype=bool)
+        
+        # Calculate the first day included (cutoffs are the current time minus the period,
+        # so whole transaction days after it count)
+        today = np.datetime64(datetime.now().date(), "D")
+        cutoff_day = today - (period_days - 1)
+        
+        # Transactions with invalid dates (NaT) never compare as in range
+        return dates >= cutoff_day
+    
+    def calculate_totals(self, flows, amounts):
+        """Calculate total expenses and income from transaction flow and amount columns"""
+        total_expenses = float(amounts[flows == "Expense"].sum())
+        total_income = float(amounts[flows == "Income"].sum())
         return total_expenses, total_income
     
-    def get_days_in_period(self, period, transactions):
+    def get_days_in_period(self, period, dates, in_period):
         """Calculate number of days in the selected period based on actual data availability"""
-        current_date = datetime.now()
-        
         if period == "Today":
             return 1
         
-        # Get all transaction dates to find the earliest one
-        all_transaction_dates = []
-        try:
-            with open(get_data_file_path("transactions_database.csv"), 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                next(reader)  # Skip header
-                for row in reader:
-                    if row and len(row) >= 5:
-                        try:
-                            date = datetime.strptime(row[4], "%d/%m/%Y")
-                            all_transaction_dates.append(date)
-                        except ValueError:
-                            continue
-        except FileNotFoundError:
+        # Find the earliest transaction date (invalid dates are NaT and ignored)
+        valid_dates = dates[~np.isnat(dates)]
+        if not len(valid_dates):
             return 1
         
-        if not all_transaction_dates:
-            return 1
+        today = np.datetime64(datetime.now().date(), "D")
         
-        earliest_transaction_date = min(all_transaction_dates)
-        
-        # Calculate the theoretical start date for the period
-        if period == "Last 7 days":
-            theoretical_start = current_date - timedelta(days=7)
-        elif period == "Last 30 days":
-            theoretical_start = current_date - timedelta(days=30)
-        elif period == "Last 12 months":
-            theoretical_start = current_date - timedelta(days=365)
-        elif period == "All Time":
+        # Days in the period, counted like the period cutoffs (including today)
+        period_days = self.PERIOD_DAYS.get(period)
+        if period_days is None:
             # For "All Time", use actual data range
-            if transactions:
-                dates = []
-                for transaction in transactions:
-                    try:
-                        date = datetime.strptime(transaction[4], "%d/%m/%Y")
-                        dates.append(date)
-                    except ValueError:
-                        continue
-                
-                if dates:
-                    min_date = min(dates)
-                    max_date = max(dates)
-                    days = (max_date - min_date).days + 1
-                    return max(1, days)
-            return 1
-        else:
-            return 1
+            period_dates = dates[in_period & ~np.isnat(dates)]
+            if not len(period_dates):
+                return 1
+            days = int((period_dates.max() - period_dates.min()).astype(int)) + 1
+            return max(1, days)
         
         # Use the later of the theoretical start date or the earliest transaction date
-        actual_start_date = max(theoretical_start, earliest_transaction_date)
-        
-        # Calculate days from actual start to now
-        days = (current_date - actual_start_date).days + 1
+        days_since_earliest = int((today - valid_dates.min()).astype(int))
+        days = min(period_days, days_since_earliest) + 1
         
         return max(1, days)  # At least 1 day
 
 class Settings(Page):
     def __init__(self, parent, controller):
         super().__init__(parent, controller)
-        label = ttk.Label(self, text="Settings Page", font=("Arial", 24))
+        label = ttk.Label(self, text="Settings Page", font=FONT_24)
         label.pack(pady=20, padx=20)
 
 if __name__ == "__main__":